@@ -19,7 +19,7 @@ from config import get_config
 # Import service instances (these are singletons created in each service module)
 from services.database import db_service
 from services.ai_service import ai_service
-from services.youtube_service import youtube_service
+from services.youtube_service import get_youtube_service
 from services.reddit_service import reddit_service
 from services.comment_fetcher import comment_fetcher
 
@@ -76,7 +76,11 @@ def initialize_services(app: Flask):
         # Attach existing service instances to the app
         app.db_service = db_service
         app.ai_service = ai_service
-        app.youtube_service = youtube_service
+        try:
+            app.youtube_service = get_youtube_service()
+        except Exception as e:
+            app.logger.error(f"YouTube service failed to initialize: {e}")
+            app.youtube_service = None
         app.reddit_service = reddit_service
         app.comment_fetcher = comment_fetcher
         
@@ -236,11 +240,6 @@ def get_ai_service():
     return ai_service
 
 
-def get_youtube_service():
-    """Get the YouTube service instance"""
-    return youtube_service
-
-
 def get_reddit_service():
     """Get the Reddit service instance"""
     return reddit_service
@@ -37,6 +37,8 @@ class Config:
     
     # Query Generation Settings
     NUM_QUERY_VARIATIONS = int(os.getenv('NUM_QUERY_VARIATIONS', '20'))
+    QUERY_VARIATION_CACHE_SIZE = int(os.getenv('QUERY_VARIATION_CACHE_SIZE', '4096'))
+    QUERY_VARIATION_CACHE_TTL = int(os.getenv('QUERY_VARIATION_CACHE_TTL', '86400'))  # Seconds
     MAX_RETRY_ATTEMPTS = int(os.getenv('MAX_RETRY_ATTEMPTS', '3'))
     
     # File Storage Settings
@@ -44,14 +46,43 @@ class Config:
     HISTORY_DIRECTORY = os.getenv('HISTORY_DIRECTORY', 'history')
     MAX_FILENAME_LENGTH = int(os.getenv('MAX_FILENAME_LENGTH', '50'))
     
+    # Logging Configuration
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()  # DEBUG shows per-attempt/per-query detail
+    
     # Threading Configuration
     MAX_WORKERS = int(os.getenv('MAX_WORKERS', '4'))
     FETCH_TIMEOUT = int(os.getenv('FETCH_TIMEOUT', '180'))
+    IO_POOL_WORKERS = int(os.getenv('IO_POOL_WORKERS', '32'))  # Shared pool for source fetches
+
+    # HTTP Connection Pooling
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '32'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '64'))
     
     # Rate Limiting - Optimized for parallel processing
     PAUSE_BETWEEN_QUERIES = int(os.getenv('PAUSE_BETWEEN_QUERIES', '1'))  # Reduced for faster processing
     PAUSE_BETWEEN_ATTEMPTS = int(os.getenv('PAUSE_BETWEEN_ATTEMPTS', '2'))  # Reduced for faster processing
     
+    # Shared token buckets gating source fetches across parallel queries
+    YOUTUBE_RPS = float(os.getenv('YOUTUBE_RPS', '4'))  # Fetches started per second
+    YOUTUBE_BURST = int(os.getenv('YOUTUBE_BURST', '8'))  # Back-to-back fetches allowed
+    REDDIT_RPS = float(os.getenv('REDDIT_RPS', '2'))
+    REDDIT_BURST = int(os.getenv('REDDIT_BURST', '4'))
+    RATE_LIMIT_PENALTY_SECONDS = int(os.getenv('RATE_LIMIT_PENALTY_SECONDS', '30'))  # Pause after a 429/quota error
+    
+    # YouTube Response Caching (TTLs in seconds)
+    YOUTUBE_CACHE_SIZE = int(os.getenv('YOUTUBE_CACHE_SIZE', '10000'))
+    YOUTUBE_SEARCH_CACHE_TTL = int(os.getenv('YOUTUBE_SEARCH_CACHE_TTL', '900'))
+    YOUTUBE_DETAILS_CACHE_TTL = int(os.getenv('YOUTUBE_DETAILS_CACHE_TTL', '21600'))
+    YOUTUBE_TRENDING_CACHE_TTL = int(os.getenv('YOUTUBE_TRENDING_CACHE_TTL', '3600'))
+    YOUTUBE_DISK_CACHE = os.getenv('YOUTUBE_DISK_CACHE', 'True').lower() == 'true'  # Persist responses across restarts
+    CACHE_DIRECTORY = os.getenv('CACHE_DIRECTORY', 'cache')
+    YOUTUBE_KEY_COOLDOWN_SECONDS = int(os.getenv('YOUTUBE_KEY_COOLDOWN_SECONDS', '3600'))  # Rest for a quota-limited key
+    
+    # YouTube Reply Fetching - threads only embed up to 5 replies; fetching the
+    # rest costs one extra API call per 100 replies of each thread
+    YOUTUBE_FETCH_ALL_REPLIES = os.getenv('YOUTUBE_FETCH_ALL_REPLIES', 'False').lower() == 'true'
+    MAX_REPLIES_PER_COMMENT = int(os.getenv('MAX_REPLIES_PER_COMMENT', '100'))
+    
     @classmethod
     def validate_required_env_vars(cls):
         """Validate that all required environment variables are set"""
@@ -145,9 +145,13 @@ def delete_batch(batch_id):
         if result.deleted_count == 0:
             return jsonify({'error': 'Batch not found or already deleted'}), 404
 
+        # None means the batch's comments and videos/posts could not be removed
+        deleted_documents = db_service.delete_batch_documents([batch_id])
+
         return jsonify({
             'message': f'Batch {batch_id} deleted successfully',
-            'deleted_count': result.deleted_count
+            'deleted_count': result.deleted_count,
+            'deleted_documents': deleted_documents
         })
 
     except Exception as e:
@@ -219,10 +223,13 @@ def cleanup_database():
         batch_ids_to_delete = [record['batch_id'] for record in records_to_delete]
         
         result = collection.delete_many({'batch_id': {'$in': batch_ids_to_delete}})
+        # None means the batches' comments and videos/posts could not be removed
+        deleted_documents = db_service.delete_batch_documents(batch_ids_to_delete)
         
         return jsonify({
             'message': f'Cleanup completed. Deleted {result.deleted_count} old records.',
             'deleted_count': result.deleted_count,
+            'deleted_documents': deleted_documents,
             'remaining_records': total_records - result.deleted_count
         })
 
@@ -3,9 +3,12 @@ Main search routes for the YouTube Scrapping API
 Handles search requests and AI-powered query generation
 """
 import time
+import traceback
+from collections import Counter
 from flask import Blueprint, request, jsonify
 from services.ai_service import ai_service
 from services.comment_fetcher import comment_fetcher
+from services.database import db_service
 from utils.helpers import validate_query, format_duration, get_current_timestamp
 
 search_bp = Blueprint('search', __name__)
@@ -70,15 +73,18 @@ def search():
         unique_count = aggregation_result['unique_count']
         unique_comments = aggregation_result['unique_comments']
 
-        print(f"🎯 Final Results:")
-        print(f"   Total comments processed: {total_comments}")
-        print(f"   Total replies processed: {total_replies}")
-        print(f"   Grand total processed: {grand_total}")
-        print(f"   Unique comments: {unique_count}")
-        print(f"   Target achieved: {aggregation_result['target_achieved']}")
-        print(f"   Successful queries: {aggregation_result['successful_queries']}")
-        print(f"   Failed queries: {aggregation_result['failed_queries']}")
-        print(f"   Total latency: {format_duration(latency_seconds)}")
+        # One write for the whole block instead of a stdout round-trip per line
+        print("\n".join((
+            "🎯 Final Results:",
+            f"   Total comments processed: {total_comments}",
+            f"   Total replies processed: {total_replies}",
+            f"   Grand total processed: {grand_total}",
+            f"   Unique comments: {unique_count}",
+            f"   Target achieved: {aggregation_result['target_achieved']}",
+            f"   Successful queries: {aggregation_result['successful_queries']}",
+            f"   Failed queries: {aggregation_result['failed_queries']}",
+            f"   Total latency: {format_duration(latency_seconds)}"
+        )))
 
         # Save unified data
         print("💾 Saving unified data...")
@@ -89,34 +95,31 @@ def search():
             unique_count,
             total_replies,
             grand_total,
-            ['youtube', 'reddit']
+            ['youtube', 'reddit'],
+            source_comments=aggregation_result['source_comments']
         )
 
         print(f"✅ Data saved with result: {save_result}")
 
-        # Calculate additional stats with debug info
-        youtube_videos = [v for v in aggregation_result['videos'] if v.get('source') == 'youtube']
-        reddit_posts = [v for v in aggregation_result['videos'] if v.get('source') == 'reddit']
+        # Calculate additional stats with debug info; one pass over the videos
+        # gives both the per-source totals and the breakdown
+        sources_debug = Counter(video.get('source', 'unknown') for video in aggregation_result['videos'])
+        total_youtube_videos = sources_debug['youtube']
+        total_reddit_posts = sources_debug['reddit']
         
         print(f"📊 Final video breakdown:")
         print(f"   Total videos in aggregation result: {len(aggregation_result['videos'])}")
-        print(f"   YouTube videos found: {len(youtube_videos)}")
-        print(f"   Reddit posts found: {len(reddit_posts)}")
-        
-        # Debug: Show sources of all videos
-        sources_debug = {}
-        for video in aggregation_result['videos']:
-            source = video.get('source', 'unknown')
-            sources_debug[source] = sources_debug.get(source, 0) + 1
-        print(f"   Sources breakdown: {sources_debug}")
+        print(f"   YouTube videos found: {total_youtube_videos}")
+        print(f"   Reddit posts found: {total_reddit_posts}")
+        print(f"   Sources breakdown: {dict(sources_debug)}")
 
         result = {
             'search_query': original_query,
             'query_variations_generated': len(query_variations),
             'batch_id': combined_data['batch_id'] if combined_data else None,
             'sources': ['youtube', 'reddit'],
-            'total_youtube_videos': len(youtube_videos),
-            'total_reddit_posts': len(reddit_posts),
+            'total_youtube_videos': total_youtube_videos,
+            'total_reddit_posts': total_reddit_posts,
             'total_comments': total_comments,
             'total_replies': total_replies,
             'grand_total': grand_total,
@@ -139,7 +142,6 @@ def search():
 
     except Exception as e:
         print(f"ERROR in AI search endpoint: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': f'AI-powered search failed: {str(e)}'}), 500
 
@@ -185,7 +187,8 @@ def simple_search():
             unique_count,
             total_replies,
             result['total_comments'],
-            result['sources']
+            result['sources'],
+            source_comments=result['source_comments']
         )
 
         response = {
@@ -218,8 +221,6 @@ def simple_search():
 def get_search_status(batch_id):
     """Get status of a search operation by batch ID"""
     try:
-        from services.database import db_service
-        
         result = db_service.get_search_result(batch_id)
         
         if not result:
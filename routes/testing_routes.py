@@ -201,7 +201,7 @@ def test_services():
     try:
         from services.database import db_service
         from services.ai_service import ai_service
-        from services.youtube_service import youtube_service
+        from services.youtube_service import get_youtube_service
         from services.reddit_service import reddit_service
         
         test_results = {}
@@ -235,7 +235,7 @@ def test_services():
         # Test YouTube service
         try:
             # Just check if it initializes properly
-            youtube_service.youtube  # This will throw if API key is invalid
+            get_youtube_service().youtube  # This will throw if API key is invalid
             test_results['youtube_service'] = {
                 'status': 'success',
                 'message': 'YouTube service initialized successfully'
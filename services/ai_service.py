@@ -4,6 +4,7 @@ Handles Gemini AI integration and query variations
 """
 import google.generativeai as genai
 from config import Config
+from utils.cache_utils import TTLCache
 
 
 class AIService:
@@ -17,6 +18,12 @@ class AIService:
         else:
             self.model = None
             print("⚠️  Gemini API key not configured - AI features will be disabled")
+        
+        # Generated variations, keyed by (normalized query, count)
+        self._variation_cache = TTLCache(
+            maxsize=self.config.QUERY_VARIATION_CACHE_SIZE,
+            ttl=self.config.QUERY_VARIATION_CACHE_TTL
+        )
     
     def is_available(self):
         """Check if AI service is available"""
@@ -31,6 +38,12 @@ class AIService:
         if num_variations is None:
             num_variations = self.config.NUM_QUERY_VARIATIONS
         
+        cache_key = (' '.join(original_query.casefold().split()), num_variations)
+        cached_variations = self._variation_cache.get(cache_key)
+        if cached_variations is not None:
+            print(f"⚡ Using {len(cached_variations)} cached query variations")
+            return list(cached_variations)
+        
         try:
             print(f"🤖 Generating {num_variations} query variations using Gemini AI...")
 
@@ -80,6 +93,7 @@ class AIService:
             if len(variations) > 5:
                 print(f"   ... and {len(variations) - 5} more")
 
+            self._variation_cache.set(cache_key, tuple(variations))
             return variations
 
         except Exception as e:
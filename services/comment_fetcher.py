@@ -3,16 +3,74 @@ Unified comment fetcher service
 Orchestrates YouTube and Reddit comment fetching with AI-powered query generation
 Optimized for parallel processing to achieve sub-minute latency
 """
+import threading
 import time
-import uuid
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from operator import itemgetter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from config import Config
 from services.ai_service import ai_service
-from services.youtube_service import youtube_service
+from services.youtube_service import get_youtube_service
 from services.reddit_service import reddit_service
 from services.database import db_service
-from utils.file_utils import save_to_json_file, sanitize_filename
+from utils.file_utils import save_to_json_file, save_to_jsonl_file, sanitize_filename
+from utils.helpers import generate_batch_id, text_hash64, normalize_comment_text
+from utils.log_utils import get_logger
+from utils.rate_limiter import TokenBucket, is_rate_limit_error
+
+
+logger = get_logger(__name__)
+
+_get_comments = itemgetter('comments')
+
+SOURCE_LABELS = {'youtube': 'YouTube', 'reddit': 'Reddit'}
+SOURCE_RESULT_TIMEOUT = 120  # Seconds to wait for both sources of one attempt
+
+
+
+def count_comments(videos):
+    """Count the top-level comments across videos/posts"""
+    return sum(map(len, map(_get_comments, videos)))
+
+
+def count_replies(videos):
+    """Count the replies attached to the comments of videos/posts"""
+    return sum(len(comment.get('replies', ())) for comment in chain.from_iterable(map(_get_comments, videos)))
+
+
+class QueryResult:
+    """Per-query outcome of a multi-query aggregation"""
+    
+    __slots__ = ('query', 'status', 'total_comments', 'total_replies', 'unique_comments',
+                 'new_unique_comments', 'sources', 'attempts', 'error')
+    
+    def __init__(self, query, status, total_comments=0, total_replies=0, unique_comments=0,
+                 new_unique_comments=0, sources=(), attempts=0, error=None):
+        self.query = query
+        self.status = status
+        self.total_comments = total_comments
+        self.total_replies = total_replies
+        self.unique_comments = unique_comments
+        self.new_unique_comments = new_unique_comments
+        self.sources = sources
+        self.attempts = attempts
+        self.error = error
+    
+    def to_dict(self):
+        """Convert to the JSON-ready dict returned to API callers"""
+        if self.status == 'failed':
+            return {'query': self.query, 'status': self.status, 'error': self.error}
+        return {
+            'query': self.query,
+            'status': self.status,
+            'total_comments': self.total_comments,
+            'total_replies': self.total_replies,
+            'unique_comments': self.unique_comments,
+            'new_unique_comments': self.new_unique_comments,
+            'sources': self.sources,
+            'attempts': self.attempts
+        }
 
 
 class UnifiedCommentFetcher:
@@ -21,190 +79,247 @@ class UnifiedCommentFetcher:
     def __init__(self):
         self.config = Config()
         self.ai_service = ai_service
-        self.youtube_service = youtube_service
+        self._youtube_service = None  # Resolved on first YouTube fetch
         self.reddit_service = reddit_service
         self.db_service = db_service
+
+        # Long-lived pool reused across requests and retry attempts, so
+        # no threads are spawned or torn down per fetch
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=self.config.IO_POOL_WORKERS,
+            thread_name_prefix="cf-io"
+        )
+
+        # Small separate pool for saving results (MongoDB + two backup files),
+        # so saves never queue behind fetches waiting on rate limits
+        self._save_pool = ThreadPoolExecutor(
+            max_workers=3,
+            thread_name_prefix="cf-save"
+        )
+
+        # Shared per-provider limiters so parallel queries can't burst past quotas
+        self._youtube_bucket = TokenBucket(self.config.YOUTUBE_RPS, self.config.YOUTUBE_BURST)
+        self._reddit_bucket = TokenBucket(self.config.REDDIT_RPS, self.config.REDDIT_BURST)
     
+    @property
+    def youtube_service(self):
+        """The YouTube service, resolved to the shared instance on first use"""
+        if self._youtube_service is None:
+            self._youtube_service = get_youtube_service()
+        return self._youtube_service
+
+    @youtube_service.setter
+    def youtube_service(self, service):
+        self._youtube_service = service
+
+    def _fetch_youtube(self, query, attempt=1, max_videos=15, comments_per_video=100, stop_event=None):  # Reduced for faster processing
+        """Fetch YouTube videos with comments for a single query"""
+        try:
+            if stop_event is not None and stop_event.is_set():
+                return {'error': 'cancelled'}
+            logger.info("🔍 Starting YouTube search for: '%s'", query)
+            # Reduce video count and comments for faster processing
+            video_count = max_videos + (attempt - 1) * 5  # Smaller increments
+            comments_per_video = comments_per_video + (attempt - 1) * 20
+
+            self._youtube_bucket.acquire()
+            if stop_event is not None and stop_event.is_set():
+                return {'error': 'cancelled'}
+            videos_with_comments = self.youtube_service.search_and_get_comments(
+                query, 
+                max_videos=video_count, 
+                max_comments_per_video=comments_per_video,
+                stop_event=stop_event
+            )
+
+            if not videos_with_comments:
+                return {'error': 'No YouTube videos found'}
+
+            total_yt_comments = count_comments(videos_with_comments)
+            logger.info("📺 YouTube result: %s videos, %s comments", len(videos_with_comments), total_yt_comments)
+
+            return {
+                'source': 'youtube',
+                'videos': videos_with_comments,
+                'total_comments': total_yt_comments,
+                'total_replies': count_replies(videos_with_comments)
+            }
+
+        except Exception as e:
+            error_msg = str(e)
+            # Log the specific error but still count partial success
+            if is_rate_limit_error(e):
+                logger.warning("⚠️ YouTube rate limited, pausing fetches for %ss: %s", self.config.RATE_LIMIT_PENALTY_SECONDS, e)
+                self._youtube_bucket.penalize(self.config.RATE_LIMIT_PENALTY_SECONDS)
+            elif "SSL" in error_msg or "ssl" in error_msg.lower():
+                logger.warning("⚠️ YouTube SSL error (partial data may still be collected): %s", e)
+            else:
+                logger.error("❌ YouTube fetch error: %s", e)
+            return {'error': error_msg}
+
+    def _fetch_reddit(self, query, attempt=1, comments_limit=2000, stop_event=None):  # Reduced for faster processing
+        """Fetch Reddit comments for a single query in the unified post format"""
+        try:
+            if stop_event is not None and stop_event.is_set():
+                return {'error': 'cancelled'}
+            logger.info("🔍 Starting Reddit search for: '%s'", query)
+            # Reduce comment limit for faster processing
+            reddit_limit = comments_limit + (attempt - 1) * 500
+
+            self._reddit_bucket.acquire()
+            if stop_event is not None and stop_event.is_set():
+                return {'error': 'cancelled'}
+            # Comments come back already grouped into one unified entry per post
+            reddit_posts = self.reddit_service.get_posts_parallel(query, reddit_limit, stop_event=stop_event)
+            total_reddit_comments = count_comments(reddit_posts)
+
+            logger.info("🟠 Reddit result: %s comments from %s posts", total_reddit_comments, len(reddit_posts))
+
+            return {
+                'source': 'reddit',
+                'videos': reddit_posts,
+                'total_comments': total_reddit_comments,
+                'total_replies': count_replies(reddit_posts)
+            }
+
+        except Exception as e:
+            if is_rate_limit_error(e):
+                logger.warning("⚠️ Reddit rate limited, pausing fetches for %ss: %s", self.config.RATE_LIMIT_PENALTY_SECONDS, e)
+                self._reddit_bucket.penalize(self.config.RATE_LIMIT_PENALTY_SECONDS)
+            else:
+                logger.error("❌ Reddit fetch error: %s", e)
+            return {'error': str(e)}
+
     def fetch_all_comments_parallel(self, query, min_total_comments=None, max_retries=None):
         """Fetch comments from both YouTube and Reddit in parallel with retry logic"""
+        config = self.config
         if min_total_comments is None:
-            min_total_comments = self.config.TARGET_TOTAL_COMMENTS
+            min_total_comments = config.TARGET_TOTAL_COMMENTS
         if max_retries is None:
-            max_retries = self.config.MAX_RETRY_ATTEMPTS
+            max_retries = config.MAX_RETRY_ATTEMPTS
+        pause_between_attempts = config.PAUSE_BETWEEN_ATTEMPTS
+        submit = self._io_pool.submit
+        fetch_youtube = self._fetch_youtube
+        fetch_reddit = self._fetch_reddit
         
-        print(f"=== FETCHING COMMENTS FOR: '{query}' ===")
-        print(f"Target: Minimum {min_total_comments} total comments (comments + replies)")
+        logger.info("=== FETCHING COMMENTS FOR: '%s' ===\n"
+                    "Target: Minimum %s total comments (comments + replies)", query, min_total_comments)
 
         all_videos = []
         total_comments = 0
         total_replies = 0
+        source_comments = {'youtube': 0, 'reddit': 0}  # Running per-source totals
         attempt = 1
         sources_used = []
 
         while total_comments + total_replies < min_total_comments and attempt <= max_retries:
-            print(f"\n--- ATTEMPT {attempt}/{max_retries} ---")
+            logger.info("\n--- ATTEMPT %s/%s ---", attempt, max_retries)
 
             results = {}
             errors = {}
 
-            def fetch_youtube(max_videos=15, comments_per_video=100):  # Reduced for faster processing
-                try:
-                    print(f"🔍 Starting YouTube search for: '{query}'")
-                    # Reduce video count and comments for faster processing
-                    video_count = max_videos + (attempt - 1) * 5  # Smaller increments
-                    comments_per_video = comments_per_video + (attempt - 1) * 20
-
-                    videos_with_comments = self.youtube_service.search_and_get_comments(
-                        query, 
-                        max_videos=video_count, 
-                        max_comments_per_video=comments_per_video
-                    )
-
-                    if not videos_with_comments:
-                        return {'error': 'No YouTube videos found'}
-
-                    total_yt_comments = sum(len(v['comments']) for v in videos_with_comments)
-                    print(f"📺 YouTube result: {len(videos_with_comments)} videos, {total_yt_comments} comments")
-
-                    return {
-                        'source': 'youtube',
-                        'videos': videos_with_comments,
-                        'total_comments': total_yt_comments
-                    }
-
-                except Exception as e:
-                    error_msg = str(e)
-                    # Log the specific error but still count partial success
-                    if "SSL" in error_msg or "ssl" in error_msg.lower():
-                        print(f"⚠️ YouTube SSL error (partial data may still be collected): {e}")
-                    else:
-                        print(f"❌ YouTube fetch error: {e}")
-                    return {'error': error_msg}
-
-            def fetch_reddit(comments_limit=2000):  # Reduced for faster processing
-                try:
-                    print(f"🔍 Starting Reddit search for: '{query}'")
-                    # Reduce comment limit for faster processing
-                    reddit_limit = comments_limit + (attempt - 1) * 500
-
-                    reddit_comments = self.reddit_service.get_comments_parallel(query, reddit_limit)
-
-                    # Convert Reddit comments to unified format
-                    reddit_posts = []
-                    for comment in reddit_comments:
-                        reddit_posts.append({
-                            'post_info': {
-                                'title': comment['post_title'],
-                                'subreddit': comment['subreddit'],
-                                'source': 'reddit'
-                            },
-                            'comments': [comment],
-                            'comment_count': 1,
-                            'source': 'reddit'
-                        })
-
-                    print(f"🟠 Reddit result: {len(reddit_comments)} comments")
-
-                    return {
-                        'source': 'reddit',
-                        'videos': reddit_posts,
-                        'total_comments': len(reddit_comments)
-                    }
-
-                except Exception as e:
-                    print(f"❌ Reddit fetch error: {e}")
-                    return {'error': str(e)}
-
-            # Run both fetches in parallel with reduced timeout for speed
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                future_yt = executor.submit(fetch_youtube)
-                future_reddit = executor.submit(fetch_reddit)
-
-                # Get results with shorter timeout for faster processing
-                try:
-                    yt_result = future_yt.result(timeout=120)  # Reduced timeout for speed
-                    if 'error' not in yt_result:
-                        results['youtube'] = yt_result
-                        if 'youtube' not in sources_used:
-                            sources_used.append('youtube')
-                        print(f"✅ YouTube successful: {yt_result['total_comments']} comments from {len(yt_result['videos'])} videos")
-                    else:
-                        errors['youtube'] = yt_result['error']
-                        print(f"❌ YouTube failed: {yt_result['error']}")
-                except Exception as e:
-                    errors['youtube'] = str(e)
-                    print(f"❌ YouTube exception: {str(e)}")
-
-                try:
-                    reddit_result = future_reddit.result(timeout=120)  # Reduced timeout for speed
-                    if 'error' not in reddit_result:
-                        results['reddit'] = reddit_result
-                        if 'reddit' not in sources_used:
-                            sources_used.append('reddit')
-                        print(f"✅ Reddit successful: {reddit_result['total_comments']} comments")
-                    else:
-                        errors['reddit'] = reddit_result['error']
-                        print(f"❌ Reddit failed: {reddit_result['error']}")
-                except Exception as e:
-                    errors['reddit'] = str(e)
-                    print(f"❌ Reddit exception: {str(e)}")
-
-            # Add new results to accumulated data
-            attempt_videos = []
+            # Run both fetches in parallel on the shared I/O pool and handle
+            # each result as soon as it lands, within one shared deadline
+            future_to_source = {
+                submit(fetch_youtube, query, attempt): 'youtube',
+                submit(fetch_reddit, query, attempt): 'reddit'
+            }
+            pending = set(future_to_source)
+            deadline = time.monotonic() + SOURCE_RESULT_TIMEOUT
+            while pending:
+                done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+
+                for future in done:
+                    source = future_to_source[future]
+                    label = SOURCE_LABELS[source]
+                    try:
+                        source_result = future.result()
+                    except Exception as e:
+                        errors[source] = str(e)
+                        logger.error("❌ %s exception: %s", label, e)
+                        continue
+
+                    if 'error' in source_result:
+                        errors[source] = source_result['error']
+                        logger.error("❌ %s failed: %s", label, source_result['error'])
+                        continue
+
+                    results[source] = source_result
+                    if source not in sources_used:
+                        sources_used.append(source)
+                    logger.info("✅ %s successful: %s comments from %s %s", label, source_result['total_comments'],
+                                len(source_result['videos']), 'videos' if source == 'youtube' else 'posts')
+
+            # Anything still running has missed the deadline
+            for future in pending:
+                future.cancel()
+                source = future_to_source[future]
+                errors[source] = f'Timed out after {SOURCE_RESULT_TIMEOUT} seconds'
+                logger.error("❌ %s exception: %s", SOURCE_LABELS[source], errors[source])
+
+            # Add new results to accumulated data; the fetchers already
+            # counted comments and replies, so nothing is re-walked here
+            attempt_video_count = 0
             attempt_comments = 0
             attempt_replies = 0
 
             if 'youtube' in results:
-                attempt_videos.extend(results['youtube']['videos'])
+                all_videos.extend(results['youtube']['videos'])
+                attempt_video_count += len(results['youtube']['videos'])
                 attempt_comments += results['youtube']['total_comments']
-                print(f"✅ YouTube added: {len(results['youtube']['videos'])} videos, {results['youtube']['total_comments']} comments")
+                attempt_replies += results['youtube']['total_replies']
+                source_comments['youtube'] += results['youtube']['total_comments']
+                logger.debug("✅ YouTube added: %s videos, %s comments", len(results['youtube']['videos']), results['youtube']['total_comments'])
 
             if 'reddit' in results:
-                attempt_videos.extend(results['reddit']['videos'])
+                all_videos.extend(results['reddit']['videos'])
+                attempt_video_count += len(results['reddit']['videos'])
                 attempt_comments += results['reddit']['total_comments']
-                print(f"✅ Reddit added: {len(results['reddit']['videos'])} posts, {results['reddit']['total_comments']} comments")
-
-            # Calculate replies in this attempt
-            for video in attempt_videos:
-                for comment in video['comments']:
-                    attempt_replies += len(comment.get('replies', []))
+                attempt_replies += results['reddit']['total_replies']
+                source_comments['reddit'] += results['reddit']['total_comments']
+                logger.debug("✅ Reddit added: %s posts, %s comments", len(results['reddit']['videos']), results['reddit']['total_comments'])
 
             # Add to totals
-            all_videos.extend(attempt_videos)
             total_comments += attempt_comments
             total_replies += attempt_replies
 
             current_total = total_comments + total_replies
-            print(f"📊 Attempt {attempt} results:")
-            print(f"   Comments collected: {attempt_comments}")
-            print(f"   Replies collected: {attempt_replies}")
-            print(f"   Total so far: {current_total}")
-            print(f"   Target: {min_total_comments}")
-            print(f"   Videos in this attempt: {len(attempt_videos)}")
-            print(f"   Total videos so far: {len(all_videos)}")
+            logger.debug("📊 Attempt %s results:\n"
+                         "   Comments collected: %s\n"
+                         "   Replies collected: %s\n"
+                         "   Total so far: %s\n"
+                         "   Target: %s\n"
+                         "   Videos in this attempt: %s\n"
+                         "   Total videos so far: %s",
+                         attempt, attempt_comments, attempt_replies, current_total, min_total_comments,
+                         attempt_video_count, len(all_videos))
 
             # Check if we've reached the target OR if we have some data and no more sources to try
             if current_total >= min_total_comments:
-                print(f"✅ Target reached! Total: {current_total}")
+                logger.info("✅ Target reached! Total: %s", current_total)
                 break
-            elif len(attempt_videos) == 0 and attempt < max_retries:
-                print(f"⚠️  No data collected in this attempt. Starting attempt {attempt + 1}...")
-                time.sleep(self.config.PAUSE_BETWEEN_ATTEMPTS)
+            elif attempt_video_count == 0 and attempt < max_retries:
+                logger.warning("⚠️  No data collected in this attempt. Starting attempt %s...", attempt + 1)
+                time.sleep(pause_between_attempts)
             elif attempt < max_retries:
-                print(f"⚠️  Target not reached but got some data. Starting attempt {attempt + 1}...")
-                time.sleep(self.config.PAUSE_BETWEEN_ATTEMPTS)
+                logger.warning("⚠️  Target not reached but got some data. Starting attempt %s...", attempt + 1)
+                time.sleep(pause_between_attempts)
             else:
-                print(f"❌ Maximum retries reached. Final total: {current_total}")
+                logger.error("❌ Maximum retries reached. Final total: %s", current_total)
 
             attempt += 1
 
-        print(f"\n🎯 FINAL RESULTS:")
-        print(f"   Total comments: {total_comments}")
-        print(f"   Total replies: {total_replies}")
-        print(f"   Grand total: {total_comments + total_replies}")
-        print(f"   Total videos: {len(all_videos)}")
-        print(f"   Sources used: {sources_used}")
-        print(f"   Attempts made: {attempt - 1}")
+        logger.info("\n🎯 FINAL RESULTS:\n"
+                    "   Total comments: %s\n"
+                    "   Total replies: %s\n"
+                    "   Grand total: %s\n"
+                    "   Total videos: %s\n"
+                    "   Sources used: %s\n"
+                    "   Attempts made: %s",
+                    total_comments, total_replies, total_comments + total_replies, len(all_videos),
+                    sources_used, attempt - 1)
 
         return {
             'videos': all_videos,
@@ -212,103 +327,137 @@ class UnifiedCommentFetcher:
             'total_replies': total_replies,
             'grand_total': total_comments + total_replies,
             'sources': sources_used,
+            'source_comments': source_comments,
             'errors': errors,
             'target_achieved': (total_comments + total_replies) >= min_total_comments,
             'attempts_made': attempt - 1
         }
     
+    def _submit_all(self, queries, stop_event=None):
+        """Submit the YouTube and Reddit fetch for every query at once
+
+        Returns a mapping of future -> (query index, source) so results can
+        be bucketed per query as they land.
+        """
+        future_to_job = {}
+        submit = self._io_pool.submit
+        fetch_youtube = self._fetch_youtube
+        fetch_reddit = self._fetch_reddit
+        for i, query in enumerate(queries, 1):
+            future_to_job[submit(fetch_youtube, query, stop_event=stop_event)] = (i, 'youtube')
+            future_to_job[submit(fetch_reddit, query, stop_event=stop_event)] = (i, 'reddit')
+        return future_to_job
+
+    def _build_query_result(self, i, query, source_results, seen_keys=frozenset()):
+        """Combine the per-source results of one query into a query result
+
+        Comments whose keys are in ``seen_keys`` were already collected by an
+        earlier query and are left out of ``query_unique``.
+        """
+        videos = []
+        total_comments = 0
+        sources = []
+        total_replies = 0
+        source_comments = {'youtube': 0, 'reddit': 0}
+        for source in ('youtube', 'reddit'):
+            source_result = source_results.get(source)
+            if not source_result or 'error' in source_result:
+                continue
+            videos.extend(source_result['videos'])
+            total_comments += source_result['total_comments']
+            total_replies += source_result['total_replies']
+            source_comments[source] = source_result['total_comments']
+            sources.append(source)
+
+        # Consider query successful if we got ANY data (videos or comments)
+        if not videos:
+            logger.error("❌ Query %s failed - no videos collected (comments: %s)", i, total_comments)
+            return {
+                'success': False,
+                'query': query,
+                'error': f'No videos collected (got {total_comments} comments)'
+            }
+
+        # Extract the comments this query adds, keyed for the global merge
+        query_unique, query_unique_count, query_replies = self._collect_unique_comments(videos, seen_keys)
+
+        logger.info("✅ Query %s completed: %s videos, %s comments, %s unique", i, len(videos), total_comments, query_unique_count)
+
+        return {
+            'success': True,
+            'query': query,
+            'query_unique': query_unique,
+            'query_unique_count': query_unique_count,
+            'query_replies': query_replies,
+            'videos': videos,
+            'total_comments': total_comments,
+            'total_replies': total_replies,
+            'source_comments': source_comments,
+            'sources': sources,
+            'attempts': 1
+        }
+
     def fetch_multiple_queries_aggregated(self, queries, target_total_comments=None):
         """Fetch comments for multiple queries in parallel and aggregate unique results"""
         if target_total_comments is None:
             target_total_comments = self.config.TARGET_TOTAL_COMMENTS
+        total_queries = len(queries)
         
-        print(f"🚀 STARTING PARALLEL MULTI-QUERY AGGREGATION")
-        print(f"📋 Total queries to process: {len(queries)}")
-        print(f"🎯 Target unique comments: {target_total_comments}")
-        print(f"⚡ Processing queries in parallel for maximum speed!")
+        logger.info("🚀 STARTING PARALLEL MULTI-QUERY AGGREGATION\n"
+                    "📋 Total queries to process: %s\n"
+                    "🎯 Target unique comments: %s\n"
+                    "⚡ Processing queries in parallel for maximum speed!", total_queries, target_total_comments)
 
-        all_unique_comments = {}
+        seen_comment_keys = set()  # 64-bit hashes of normalized comment text
+        all_unique_comments = []
         all_videos_data = []
         total_processed_comments = 0
         total_processed_replies = 0
+        source_comments = {'youtube': 0, 'reddit': 0}  # Running per-source totals
         successful_queries = 0
         failed_queries = 0
         query_results = []
         
         start_time = time.time()
 
-        def process_single_query(query_info):
-            """Process a single query - designed for parallel execution"""
-            i, query = query_info
-            print(f"� Starting parallel processing for Query {i}/{len(queries)}: '{query}'")
-            
-            try:
-                # Fetch comments for this specific query
-                query_result = self.fetch_all_comments_parallel(
-                    query=query,
-                    min_total_comments=max(1000, target_total_comments // len(queries)),  # Further reduced for faster completion
-                    max_retries=1  # Reduced retries for speed
-                )
-
-                # Consider query successful if we got ANY data (videos or comments)
-                if query_result['videos'] and len(query_result['videos']) > 0:
-                    # Extract unique comments from this query
-                    query_unique, query_unique_count, query_replies = self.get_unique_comments_unified(query_result['videos'])
-
-                    print(f"✅ Query {i} completed: {len(query_result['videos'])} videos, {query_result['total_comments']} comments, {query_unique_count} unique")
-                    
-                    return {
-                        'success': True,
-                        'query': query,
-                        'query_unique': query_unique,
-                        'query_unique_count': query_unique_count,
-                        'query_replies': query_replies,
-                        'videos': query_result['videos'],
-                        'total_comments': query_result['total_comments'],
-                        'total_replies': query_result['total_replies'],
-                        'sources': query_result['sources'],
-                        'attempts': query_result['attempts_made']
-                    }
-                else:
-                    print(f"❌ Query {i} failed - no videos collected (comments: {query_result.get('total_comments', 0)})")
-                    return {
-                        'success': False,
-                        'query': query,
-                        'error': f'No videos collected (got {query_result.get("total_comments", 0)} comments)'
-                    }
+        # Fan out every YouTube and Reddit fetch at once instead of nesting
+        # a per-query pool inside a pool of query processors
+        logger.info("🏃‍♂️ Launching %s parallel source fetches for %s queries...", total_queries * 2, total_queries)
+        
+        stop_event = threading.Event()
+        future_to_job = self._submit_all(queries, stop_event)
+        pending_sources = {}
+        build_query_result = self._build_query_result
+        progress_interval = max(1, total_queries // 10)  # Log global progress every ~10% of queries
+        
+        # Collect results as they complete; a query is processed as soon as
+        # both of its sources have landed
+        try:
+            for future in as_completed(future_to_job):
+                i, source = future_to_job[future]
+                query = queries[i - 1]
+                try:
+                    source_result = future.result()
+                except Exception as e:
+                    logger.error("❌ %s exception for query %s: %s", source.title(), i, e)
+                    source_result = {'error': str(e)}
 
-            except Exception as e:
-                print(f"❌ Query {i} crashed: {e}")
-                return {
-                    'success': False,
-                    'query': query,
-                    'error': str(e)
-                }
+                source_results = pending_sources.setdefault(i, {})
+                source_results[source] = source_result
+                if len(source_results) < 2:
+                    continue
+                del pending_sources[i]
 
-        # Process all queries in parallel using ThreadPoolExecutor
-        print(f"🏃‍♂️ Launching {len(queries)} parallel query processors...")
-        
-        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:  # Limit to 8 concurrent threads
-            # Submit all queries for parallel processing
-            future_to_query = {
-                executor.submit(process_single_query, (i+1, query)): (i+1, query) 
-                for i, query in enumerate(queries)
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_query):
-                query_info = future_to_query[future]
                 try:
-                    result = future.result()
-                    
+                    result = build_query_result(i, query, source_results, seen_comment_keys)
+                
                     if result['success']:
-                        # Add to global unique comments (avoiding duplicates)
-                        new_unique_count = 0
-                        for comment in result['query_unique']:
-                            comment_text = comment['text'].strip()
-                            if comment_text not in all_unique_comments:
-                                all_unique_comments[comment_text] = comment
-                                new_unique_count += 1
+                        # Add to global unique comments; query_unique was already
+                        # filtered against the global set while it was collected
+                        query_unique = result['query_unique']
+                        seen_comment_keys.update(query_unique)
+                        all_unique_comments.extend(query_unique.values())
+                        new_unique_count = len(query_unique)
 
                         # Add video data
                         all_videos_data.extend(result['videos'])
@@ -316,63 +465,77 @@ class UnifiedCommentFetcher:
                         # Update totals
                         total_processed_comments += result['total_comments']
                         total_processed_replies += result['total_replies']
-
-                        query_results.append({
-                            'query': result['query'],
-                            'status': 'success',
-                            'total_comments': result['total_comments'],
-                            'total_replies': result['total_replies'],
-                            'unique_comments': result['query_unique_count'],
-                            'new_unique_comments': new_unique_count,
-                            'sources': result['sources'],
-                            'attempts': result['attempts']
-                        })
+                        for source, count in result['source_comments'].items():
+                            source_comments[source] += count
+
+                        query_results.append(QueryResult(
+                            result['query'],
+                            'success',
+                            total_comments=result['total_comments'],
+                            total_replies=result['total_replies'],
+                            unique_comments=result['query_unique_count'],
+                            new_unique_comments=new_unique_count,
+                            sources=result['sources'],
+                            attempts=result['attempts']
+                        ))
 
                         successful_queries += 1
                         current_unique_total = len(all_unique_comments)
 
-                        print(f"✅ Processed query: {result['query'][:50]}...")
-                        print(f"   📊 Comments: {result['total_comments']}, Replies: {result['total_replies']}")
-                        print(f"   🆕 New unique added: {new_unique_count}")
-                        print(f"   📈 Global unique total: {current_unique_total}")
+                        logger.debug("✅ Processed query: %.50s...\n"
+                                     "   📊 Comments: %s, Replies: %s\n"
+                                     "   🆕 New unique added: %s",
+                                     result['query'], result['total_comments'], result['total_replies'], new_unique_count)
+                        if successful_queries % progress_interval == 0:
+                            logger.info("   📈 Global unique total: %s (%s/%s queries)", current_unique_total,
+                                        successful_queries + failed_queries, total_queries)
 
-                        # Check if we've reached the target
+                        # Stop as soon as the target is reached: cancel fetches that
+                        # have not started and signal running ones to wrap up
                         if current_unique_total >= target_total_comments:
-                            print(f"🎉 TARGET REACHED! {current_unique_total} unique comments collected")
-                            # Note: We don't break here because parallel processing is already running
+                            logger.info("🎉 TARGET REACHED! %s unique comments collected", current_unique_total)
+                            stop_event.set()
+                            cancelled = sum(1 for f in future_to_job if not f.done() and f.cancel())
+                            logger.info("🛑 Stopping early: cancelled %s pending fetches", cancelled)
+                            break
                     else:
                         failed_queries += 1
-                        query_results.append({
-                            'query': result['query'],
-                            'status': 'failed',
-                            'error': result['error']
-                        })
-                        
+                        query_results.append(QueryResult(result['query'], 'failed', error=result['error']))
+                    
                 except Exception as e:
-                    print(f"❌ Error processing result for query {query_info[1]}: {e}")
+                    logger.error("❌ Error processing result for query %s: %s", query, e)
                     failed_queries += 1
+        finally:
+            # Whatever ends the loop, don't leave fetches running for nothing
+            stop_event.set()
+            for future in future_to_job:
+                future.cancel()
 
         # Calculate timing
         end_time = time.time()
         processing_time = end_time - start_time
 
         # Final results
-        final_unique_comments = list(all_unique_comments.values())
+        final_unique_comments = all_unique_comments
         final_unique_count = len(final_unique_comments)
 
-        print(f"\n{'='*60}")
-        print(f"🎯 MULTI-QUERY AGGREGATION COMPLETE")
-        print(f"{'='*60}")
-        print(f"📊 Summary:")
-        print(f"   🔢 Total queries processed: {len(queries)}")
-        print(f"   ✅ Successful queries: {successful_queries}")
-        print(f"   ❌ Failed queries: {failed_queries}")
-        print(f"   💬 Total comments processed: {total_processed_comments}")
-        print(f"   🔄 Total replies processed: {total_processed_replies}")
-        print(f"   🎯 Final unique comments: {final_unique_count}")
-        print(f"   ⏱️  Total processing time: {processing_time:.2f} seconds ({processing_time/60:.1f} minutes)")
-        print(f"   � Average time per query: {processing_time/len(queries):.2f} seconds (parallel processing)")
-        print(f"   �📈 Target achieved: {'✅ YES' if final_unique_count >= target_total_comments else '❌ NO'}")
+        logger.info("\n%s\n"
+                    "🎯 MULTI-QUERY AGGREGATION COMPLETE\n"
+                    "%s\n"
+                    "📊 Summary:\n"
+                    "   🔢 Total queries processed: %s\n"
+                    "   ✅ Successful queries: %s\n"
+                    "   ❌ Failed queries: %s\n"
+                    "   💬 Total comments processed: %s\n"
+                    "   🔄 Total replies processed: %s\n"
+                    "   🎯 Final unique comments: %s\n"
+                    "   ⏱️  Total processing time: %.2f seconds (%.1f minutes)\n"
+                    "   ⚡ Average time per query: %.2f seconds (parallel processing)\n"
+                    "   📈 Target achieved: %s",
+                    "=" * 60, "=" * 60, total_queries, successful_queries, failed_queries,
+                    total_processed_comments, total_processed_replies, final_unique_count,
+                    processing_time, processing_time / 60, processing_time / total_queries,
+                    '✅ YES' if final_unique_count >= target_total_comments else '❌ NO')
 
         return {
             'videos': all_videos_data,
@@ -381,9 +544,10 @@ class UnifiedCommentFetcher:
             'total_processed_comments': total_processed_comments,
             'total_processed_replies': total_processed_replies,
             'grand_total': total_processed_comments + total_processed_replies,
+            'source_comments': source_comments,
             'successful_queries': successful_queries,
             'failed_queries': failed_queries,
-            'query_results': query_results,
+            'query_results': [query_result.to_dict() for query_result in query_results],
             'target_achieved': final_unique_count >= target_total_comments,
             'original_queries': queries,
             'processing_time_seconds': processing_time,
@@ -392,12 +556,34 @@ class UnifiedCommentFetcher:
     
     def get_unique_comments_unified(self, videos_data):
         """Extract unique comments from both YouTube and Reddit data"""
-        unique_comments = {}
+        unique_comments, total_comments, total_replies = self._collect_unique_comments(videos_data)
+        return list(unique_comments.values()), total_comments, total_replies
+
+    def _collect_unique_comments(self, videos_data, seen_keys=frozenset()):
+        """Deduplicate comments into a dict keyed by normalized-text hash
+
+        Each comment and reply is stripped and normalized exactly once here;
+        callers merging several result sets reuse the keys directly. Comments
+        whose keys are in ``seen_keys`` are counted but not collected.
+
+        Heavily repeated strings (source, title, subreddit, author) are pooled
+        so every record shares a single copy of each.
+        """
+        pool = {}.setdefault
+        unique_comments = {}  # Keyed by 64-bit text hash to keep the table small
+        reply_keys = {}  # Hashes of the normalized reply texts already kept, per comment
+        known_keys = set()  # Keys of this batch that are in seen_keys
         total_comments = 0
         total_replies = 0
 
         for video in videos_data:
             source = video.get('source', 'unknown')
+            source = pool(source, source)
+            post_info = video.get('post_info', {})
+            video_title = video.get('video_info', {}).get('title', post_info.get('title', 'Unknown'))
+            video_title = pool(video_title, video_title)
+            subreddit = post_info.get('subreddit', '')
+            subreddit = pool(subreddit, subreddit)
 
             for comment in video['comments']:
                 comment_text = comment['text'].strip()
@@ -406,27 +592,41 @@ class UnifiedCommentFetcher:
                 if not comment_text or len(comment_text) < 3:
                     continue
 
-                if comment_text not in unique_comments:
-                    unique_comments[comment_text] = {
-                        'author': comment['author'],
+                comment_key = text_hash64(normalize_comment_text(comment_text))
+                if comment_key in seen_keys:
+                    if comment_key not in known_keys:
+                        known_keys.add(comment_key)
+                        total_comments += 1
+                    continue
+                if comment_key not in unique_comments:
+                    author = comment['author']
+                    unique_comments[comment_key] = {
+                        'author': pool(author, author),
                         'text': comment_text,
                         'likes': comment.get('likes', 0),
                         'published_at': comment['published_at'],
                         'author_profile': comment.get('author_profile', ''),
                         'source': source,
-                        'video_title': video.get('video_info', {}).get('title', video.get('post_info', {}).get('title', 'Unknown')),
-                        'subreddit': video.get('post_info', {}).get('subreddit', ''),
+                        'video_title': video_title,
+                        'subreddit': subreddit,
                         'replies': []
                     }
+                    reply_keys[comment_key] = set()
                     total_comments += 1
 
                 # Add replies
-                existing_replies = [r['text'] for r in unique_comments[comment_text]['replies']]
+                replies = unique_comments[comment_key]['replies']
+                existing_replies = reply_keys[comment_key]
                 for reply in comment.get('replies', []):
                     reply_text = reply['text'].strip()
-                    if reply_text and reply_text not in existing_replies and len(reply_text) > 3:
-                        unique_comments[comment_text]['replies'].append({
-                            'author': reply['author'],
+                    if len(reply_text) <= 3:
+                        continue
+                    reply_key = text_hash64(normalize_comment_text(reply_text))
+                    if reply_key not in existing_replies:
+                        existing_replies.add(reply_key)
+                        author = reply['author']
+                        replies.append({
+                            'author': pool(author, author),
                             'text': reply_text,
                             'likes': reply.get('likes', 0),
                             'published_at': reply['published_at'],
@@ -435,28 +635,49 @@ class UnifiedCommentFetcher:
                         })
                         total_replies += 1
 
-        return list(unique_comments.values()), total_comments, total_replies
+        return unique_comments, total_comments, total_replies
     
-    def save_unified_data(self, query, videos_data, unique_comments, unique_count, total_replies, total_comments, sources):
-        """Save unified data from both YouTube and Reddit"""
+    def save_unified_data(self, query, videos_data, unique_comments, unique_count, total_replies, total_comments, sources,
+                          source_comments=None):
+        """Save unified data from both YouTube and Reddit
+
+        ``source_comments`` holds the per-source comment totals counted while
+        fetching ({'youtube': n, 'reddit': m}); they are recounted from
+        ``videos_data`` only when not supplied.
+        """
         try:
-            batch_id = str(uuid.uuid4())[:8]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            batch_id = generate_batch_id()
+            now = datetime.now()
+            iso_timestamp = now.isoformat()
+            timestamp = now.strftime('%Y%m%d_%H%M%S')
             sanitized_query = sanitize_filename(query)
 
-            print(f"💾 Saving unified data...")
-            print(f"   Query: '{query}'")
-            print(f"   Batch ID: {batch_id}")
-            print(f"   Timestamp: {timestamp}")
-
-            # Separate YouTube and Reddit data
-            youtube_videos = [v for v in videos_data if v.get('source') == 'youtube']
-            reddit_posts = [v for v in videos_data if v.get('source') == 'reddit']
+            logger.info("💾 Saving unified data...\n"
+                        "   Query: '%s'\n"
+                        "   Batch ID: %s\n"
+                        "   Timestamp: %s", query, batch_id, timestamp)
+
+            # Separate YouTube and Reddit data and count their comments in a single pass
+            youtube_videos = []
+            reddit_posts = []
+            youtube_comments = reddit_comments = 0
+            for video in videos_data:
+                source = video.get('source')
+                if source == 'youtube':
+                    youtube_videos.append(video)
+                    youtube_comments += len(video['comments'])
+                elif source == 'reddit':
+                    reddit_posts.append(video)
+                    reddit_comments += len(video['comments'])
+
+            if source_comments is not None:
+                youtube_comments = source_comments.get('youtube', 0)
+                reddit_comments = source_comments.get('reddit', 0)
 
             combined_data = {
                 'batch_id': batch_id,
                 'query': query,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': iso_timestamp,
                 'sources': sources,
                 'total_youtube_videos': len(youtube_videos),
                 'total_reddit_posts': len(reddit_posts),
@@ -468,38 +689,36 @@ class UnifiedCommentFetcher:
                 'reddit_data': reddit_posts,
                 'unique_comments_data': unique_comments,
                 'processing_info': {
-                    'processed_at': datetime.now().isoformat(),
+                    'processed_at': iso_timestamp,
                     'duplicates_removed': total_comments - unique_count,
-                    'youtube_comments': sum(len(v['comments']) for v in youtube_videos),
-                    'reddit_comments': sum(len(v['comments']) for v in reddit_posts),
+                    'youtube_comments': youtube_comments,
+                    'reddit_comments': reddit_comments,
                     'comments_per_source_avg': {
-                        'youtube': sum(len(v['comments']) for v in youtube_videos) / len(youtube_videos) if youtube_videos else 0,
-                        'reddit': sum(len(v['comments']) for v in reddit_posts) / len(reddit_posts) if reddit_posts else 0
+                        'youtube': youtube_comments / len(youtube_videos) if youtube_videos else 0,
+                        'reddit': reddit_comments / len(reddit_posts) if reddit_posts else 0
                     }
                 }
             }
 
-            # Save to MongoDB
-            mongo_result = self.db_service.save_search_result(combined_data)
-            
-            # Save to JSON files as backup
-            videos_filename = save_to_json_file(
-                data={
-                    'batch_id': batch_id,
-                    'query': query,
-                    'timestamp': datetime.now().isoformat(),
-                    'youtube_data': youtube_videos,
-                    'reddit_data': reddit_posts
-                },
+            # Save to MongoDB and to the JSON backup files concurrently; each
+            # writer handles its own errors, so one failure doesn't stop the others
+            submit = self._save_pool.submit
+            mongo_future = submit(self.db_service.save_search_result, combined_data)
+
+            # Videos go one per line, each tagged with its source
+            videos_future = submit(
+                save_to_jsonl_file,
+                records=videos_data,
                 directory=self.config.DATA_DIRECTORY,
                 filename_prefix=f"{sanitized_query}_videos_{timestamp}_{batch_id}"
             )
 
-            history_filename = save_to_json_file(
+            history_future = submit(
+                save_to_json_file,
                 data={
                     'batch_id': batch_id,
                     'query': query,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': iso_timestamp,
                     'total_unique_comments': unique_count,
                     'unique_comments': unique_comments
                 },
@@ -507,17 +726,20 @@ class UnifiedCommentFetcher:
                 filename_prefix=f"unique_comments_{sanitized_query}_{timestamp}_{batch_id}"
             )
 
-            print(f"✅ Data saved successfully:")
-            print(f"   MongoDB: {'✅' if mongo_result else '❌'}")
-            print(f"   Videos file: {videos_filename}")
-            print(f"   History file: {history_filename}")
+            mongo_result = mongo_future.result()
+            videos_filename = videos_future.result()
+            history_filename = history_future.result()
+
+            logger.info("✅ Data saved successfully:\n"
+                        "   MongoDB: %s\n"
+                        "   Videos file: %s\n"
+                        "   History file: %s", '✅' if mongo_result else '❌', videos_filename, history_filename)
 
             return f"mongodb:{mongo_result}" if mongo_result else "files_only", combined_data
 
         except Exception as e:
-            print(f"❌ Error saving unified data: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("❌ Error saving unified data: %s", e)
+            logger.debug("Save error traceback", exc_info=True)
             return None, None
 
 
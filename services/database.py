@@ -3,6 +3,9 @@ Database service for MongoDB operations
 Handles connection management and database operations
 """
 from datetime import datetime
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from config import Config
@@ -11,10 +14,17 @@ from config import Config
 class DatabaseService:
     """MongoDB database service for managing connections and operations"""
     
+    COMMENTS_COLLECTION = 'search_comments'
+    SOURCES_COLLECTION = 'search_sources'
+    COMMENT_INSERT_BATCH_SIZE = 1000
+    # Per-item lists stored outside the batch document
+    DETACHED_FIELDS = ('unique_comments_data', 'youtube_data', 'reddit_data')
+    
     def __init__(self):
         self.client = None
         self.db = None
         self.config = Config()
+        self._indexed_collections = set()
         
     def connect(self):
         """Establish MongoDB connection"""
@@ -105,12 +115,35 @@ class DatabaseService:
                 return False, f"MongoDB test failed: {error_details}"
     
     def save_search_result(self, data):
-        """Save search result to MongoDB"""
+        """Save search result to MongoDB
+
+        Batch metadata goes to ``search_results``; the unique comments and
+        the fetched videos/posts are stored as individual documents tagged
+        with the batch ID, using unordered bulk inserts, so the batch never
+        hits the 16 MB limit on their account.
+        """
         try:
             if not self.connect():
                 return None
             
             collection = self.db['search_results']
+            search_doc = {key: value for key, value in data.items() if key not in self.DETACHED_FIELDS}
+            inserted_id = self._insert_search_document(collection, search_doc)
+            
+            if inserted_id is not None:
+                batch_id = data.get('batch_id')
+                self.save_batch_comments(batch_id, data.get('unique_comments_data') or [])
+                self.save_batch_sources(batch_id, (data.get('youtube_data') or []) + (data.get('reddit_data') or []))
+            
+            return inserted_id
+            
+        except Exception as e:
+            print(f"❌ MongoDB error: {e}")
+            return None
+    
+    def _insert_search_document(self, collection, data):
+        """Insert a search document, falling back to minimal metadata if too large"""
+        try:
             result = collection.insert_one(data)
             print(f"✅ Search result saved to MongoDB with ID: {result.inserted_id}")
             return result.inserted_id
@@ -142,6 +175,67 @@ class DatabaseService:
                 print(f"❌ MongoDB error: {e}")
                 return None
     
+    def save_batch_comments(self, batch_id, comments):
+        """Bulk insert the unique comments of a batch as individual documents"""
+        return self._insert_batch_documents(self.COMMENTS_COLLECTION, batch_id, comments, 'comments')
+    
+    def save_batch_sources(self, batch_id, videos):
+        """Bulk insert the fetched YouTube videos and Reddit posts of a batch as individual documents"""
+        return self._insert_batch_documents(self.SOURCES_COLLECTION, batch_id, videos, 'videos/posts')
+    
+    def _insert_batch_documents(self, collection_name, batch_id, items, label):
+        """Bulk insert items into a per-batch collection, tagged with the batch ID"""
+        if not items:
+            return 0
+        
+        try:
+            collection = self.db[collection_name]
+            if collection_name not in self._indexed_collections:
+                # Serves the batch lookup and its insertion-order sort in one index
+                collection.create_index([('batch_id', 1), ('_id', 1)])
+                self._indexed_collections.add(collection_name)
+            
+            inserted = 0
+            batch_size = self.COMMENT_INSERT_BATCH_SIZE
+            for start in range(0, len(items), batch_size):
+                # Encode each document to BSON once up front so pymongo sends the raw
+                # bytes as-is; the caller's dicts never pick up batch_id/_id
+                documents = [
+                    RawBSONDocument(bson.encode({'_id': ObjectId(), **item, 'batch_id': batch_id}))
+                    for item in items[start:start + batch_size]
+                ]
+                result = collection.insert_many(documents, ordered=False, bypass_document_validation=True)
+                inserted += len(result.inserted_ids)
+            
+            print(f"✅ Saved {inserted} {label} to MongoDB for batch {batch_id}")
+            return inserted
+            
+        except Exception as e:
+            print(f"❌ Error saving {label} for batch {batch_id}: {e}")
+            return 0
+    
+    def delete_batch_documents(self, batch_ids):
+        """Delete the comments and videos/posts stored for the given batches
+
+        Returns the number of comments and videos/posts deleted, or None if
+        the delete failed.
+        """
+        try:
+            if not self.connect():
+                return None
+            
+            query = {'batch_id': {'$in': list(batch_ids)}}
+            deleted = {
+                'comments': self.db[self.COMMENTS_COLLECTION].delete_many(query).deleted_count,
+                'sources': self.db[self.SOURCES_COLLECTION].delete_many(query).deleted_count
+            }
+            print(f"🧹 Deleted {deleted['comments']} comments and {deleted['sources']} videos/posts for {len(batch_ids)} batches")
+            return deleted
+            
+        except Exception as e:
+            print(f"❌ Error deleting comments and videos/posts for batches {batch_ids}: {e}")
+            return None
+    
     def get_search_result(self, batch_id):
         """Get search result by batch ID"""
         try:
@@ -154,6 +248,28 @@ class DatabaseService:
             if result:
                 # Convert ObjectId to string for JSON serialization
                 result['_id'] = str(result['_id'])
+                
+                # Unique comments are stored as separate documents
+                if 'unique_comments_data' not in result:
+                    comments_cursor = self.db[self.COMMENTS_COLLECTION].find(
+                        {'batch_id': batch_id},
+                        {'_id': 0, 'batch_id': 0}
+                    ).sort('_id', 1)
+                    result['unique_comments_data'] = list(comments_cursor)
+                
+                # So are the fetched videos/posts, in their original order
+                if 'youtube_data' not in result:
+                    sources_cursor = self.db[self.SOURCES_COLLECTION].find(
+                        {'batch_id': batch_id},
+                        {'_id': 0, 'batch_id': 0}
+                    ).sort('_id', 1)
+                    result['youtube_data'] = []
+                    result['reddit_data'] = []
+                    for video in sources_cursor:
+                        if video.get('source') == 'youtube':
+                            result['youtube_data'].append(video)
+                        elif video.get('source') == 'reddit':
+                            result['reddit_data'].append(video)
             
             return result
             
@@ -3,9 +3,37 @@ Reddit service for comment fetching and processing
 Handles Reddit API integration and comment filtering
 """
 import praw
+from prawcore.exceptions import TooManyRequests
 from datetime import datetime
+from operator import itemgetter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import Config
+from utils.http_utils import get_http_session
+from utils.rate_limiter import RateLimitError
+
+
+_get_post_key = itemgetter('subreddit', 'post_title')
+
+
+def group_comments_by_post(comments):
+    """Group Reddit comments into one unified entry per (subreddit, post title)"""
+    posts = {}
+    for comment in comments:
+        posts.setdefault(_get_post_key(comment), []).append(comment)
+
+    return [
+        {
+            'post_info': {
+                'title': post_title,
+                'subreddit': subreddit,
+                'source': 'reddit'
+            },
+            'comments': post_comments,
+            'comment_count': len(post_comments),
+            'source': 'reddit'
+        }
+        for (subreddit, post_title), post_comments in posts.items()
+    ]
 
 
 class RedditService:
@@ -23,7 +51,15 @@ class RedditService:
         self.reddit = praw.Reddit(
             client_id=self.client_id,
             client_secret=self.client_secret,
-            user_agent=self.user_agent
+            user_agent=self.user_agent,
+            requestor_kwargs={'session': get_http_session()}  # Reuse pooled keep-alive connections
+        )
+
+        # Long-lived pool for per-subreddit fetches, shared by concurrent
+        # queries instead of being spawned and torn down on every call
+        self._subreddit_pool = ThreadPoolExecutor(
+            max_workers=self.config.IO_POOL_WORKERS,
+            thread_name_prefix="reddit-sub"
         )
     
     def search_subreddits(self, query, limit=10):
@@ -84,8 +120,11 @@ class RedditService:
         else:
             return matching_terms > 0
     
-    def get_comments_from_subreddit(self, subreddit_name, query, limit=None):
-        """Fetch comments from a specific subreddit"""
+    def get_comments_from_subreddit(self, subreddit_name, query, limit=None, stop_event=None):
+        """Fetch comments from a specific subreddit
+
+        If ``stop_event`` is set, no further posts are loaded.
+        """
         if limit is None:
             limit = self.config.MAX_REDDIT_COMMENTS // 8  # Distribute across subreddits
         
@@ -113,6 +152,8 @@ class RedditService:
             relevant_comments_found = 0
 
             for post in search_results:
+                if stop_event is not None and stop_event.is_set():
+                    break
                 try:
                     # Get comments from this post
                     post.comments.replace_more(limit=0)  # Remove "load more comments" objects
@@ -168,6 +209,8 @@ class RedditService:
                     if len(comments_data) >= limit:
                         break
 
+                except TooManyRequests:
+                    raise
                 except Exception as e:
                     print(f"⚠️  Error processing post in r/{subreddit_name}: {e}")
                     continue
@@ -175,12 +218,30 @@ class RedditService:
             print(f"✅ r/{subreddit_name}: Processed {total_comments_processed} comments, found {relevant_comments_found} relevant")
             return comments_data
 
+        except TooManyRequests as e:
+            raise RateLimitError(f"Reddit rate limited r/{subreddit_name}: {e}") from e
         except Exception as e:
             print(f"❌ Error fetching comments from r/{subreddit_name}: {e}")
             return []
     
-    def get_comments_parallel(self, query, total_limit=None):
-        """Fetch comments from multiple subreddits in parallel"""
+    def get_comments_parallel(self, query, total_limit=None, stop_event=None):
+        """Fetch comments from multiple subreddits in parallel
+
+        If ``stop_event`` is set while running, subreddits not yet searched
+        are skipped and the comments collected so far are returned.
+        """
+        return self._fetch_subreddits_parallel(query, total_limit, stop_event, group_by_post=False)
+    
+    def get_posts_parallel(self, query, total_limit=None, stop_event=None):
+        """Fetch comments from multiple subreddits in parallel, grouped into per-post entries
+
+        Grouping runs on the fetch threads as each subreddit completes; see
+        ``group_comments_by_post`` for the entry format.
+        """
+        return self._fetch_subreddits_parallel(query, total_limit, stop_event, group_by_post=True)
+    
+    def _fetch_subreddits_parallel(self, query, total_limit, stop_event, group_by_post):
+        """Run the per-subreddit fetches for a query on the shared pool"""
         if total_limit is None:
             total_limit = self.config.MAX_REDDIT_COMMENTS
         
@@ -190,30 +251,47 @@ class RedditService:
             subreddits = self.search_subreddits(query, limit=8)
             print(f"📋 Searching in subreddits: {subreddits}")
 
-            all_comments = []
+            all_results = []
+            total_comments = 0
+            rate_limit_error = None
             comments_per_subreddit = max(100, total_limit // len(subreddits))
 
             def fetch_from_subreddit(subreddit_name):
-                return self.get_comments_from_subreddit(subreddit_name, query, comments_per_subreddit)
-
-            with ThreadPoolExecutor(max_workers=min(len(subreddits), self.config.MAX_WORKERS)) as executor:
-                future_to_subreddit = {
-                    executor.submit(fetch_from_subreddit, subreddit): subreddit
-                    for subreddit in subreddits
-                }
+                if stop_event is not None and stop_event.is_set():
+                    return [], 0
+                comments = self.get_comments_from_subreddit(subreddit_name, query, comments_per_subreddit, stop_event)
+                if group_by_post:
+                    return group_comments_by_post(comments), len(comments)
+                return comments, len(comments)
+
+            future_to_subreddit = {
+                self._subreddit_pool.submit(fetch_from_subreddit, subreddit): subreddit
+                for subreddit in subreddits
+            }
+
+            for future in as_completed(future_to_subreddit):
+                subreddit = future_to_subreddit[future]
+                try:
+                    results, comment_count = future.result()
+                    all_results.extend(results)
+                    total_comments += comment_count
+                    print(f"✅ Got {comment_count} comments from r/{subreddit}")
+                except RateLimitError as e:
+                    rate_limit_error = e
+                    print(f"⚠️  {e}")
+                except Exception as e:
+                    print(f"❌ Error fetching from r/{subreddit}: {e}")
 
-                for future in as_completed(future_to_subreddit):
-                    subreddit = future_to_subreddit[future]
-                    try:
-                        comments = future.result()
-                        all_comments.extend(comments)
-                        print(f"✅ Got {len(comments)} comments from r/{subreddit}")
-                    except Exception as e:
-                        print(f"❌ Error fetching from r/{subreddit}: {e}")
+            # Partial results are still worth returning; only a fully throttled
+            # fetch is reported so the caller can back off
+            if rate_limit_error is not None and not all_results:
+                raise rate_limit_error
 
-            print(f"🎯 Reddit fetch complete: {len(all_comments)} total comments from {len(subreddits)} subreddits")
-            return all_comments
+            print(f"🎯 Reddit fetch complete: {total_comments} total comments from {len(subreddits)} subreddits")
+            return all_results
 
+        except RateLimitError:
+            raise
         except Exception as e:
             print(f"❌ Error in parallel Reddit comment fetching: {e}")
             return []
@@ -3,16 +3,77 @@ YouTube service for video search and comment fetching
 Handles YouTube API integration and comment processing with API rotation
 """
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
 from config import Config
+from utils.cache_utils import TTLCache, DiskCache
+from utils.file_utils import INVALID_FILENAME_CHARS
+from utils.log_utils import get_logger
+from utils.rate_limiter import RateLimitError
+import hashlib
+import orjson
+import heapq
+import os
+import threading
 import time
 import random
 
 
+logger = get_logger(__name__)
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that decodes API responses with orjson instead of json"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_query_for_filename(query, max_length):
+    """Sanitize query string to be safe for filenames (cached; queries repeat)"""
+    # Replace spaces with underscores
+    sanitized = query.replace(' ', '_')
+    # Remove or replace special characters that are problematic in filenames
+    sanitized = INVALID_FILENAME_CHARS.sub('', sanitized)
+    # Limit length to avoid overly long filenames
+    if len(sanitized) > max_length:
+        sanitized = sanitized[:max_length]
+    # Remove trailing underscores
+    sanitized = sanitized.rstrip('_')
+    return sanitized.lower()
+
+
+def _parse_reply(reply):
+    """Convert a reply comment snippet into our reply format"""
+    return {
+        'author': reply['authorDisplayName'],
+        'text': reply['textDisplay'],
+        'likes': reply['likeCount'],
+        'published_at': reply['publishedAt'],
+        'author_profile': reply.get('authorProfileImageUrl', '')
+    }
+
+
 class YouTubeService:
     """Service for YouTube API operations and comment fetching with API rotation"""
     
+    VIDEO_IDS_PER_REQUEST = 50  # Most IDs videos().list accepts in one call
+    CONCURRENT_REQUESTS_PER_KEY = 4  # In-flight API requests allowed per API key
+    BACKOFF_BASE_SECONDS = 1.0  # Retry backoff cap before the first retry, doubled per retry
+    BACKOFF_MAX_SECONDS = 30.0
+    MAX_COOLDOWN_WAIT_SECONDS = 5.0  # Longest wait for a key to come off cooldown before giving up
+    
     def __init__(self):
         self.config = Config()
         
@@ -27,60 +88,150 @@ class YouTubeService:
         if not self.api_keys:
             raise ValueError("No valid YouTube API keys found")
         
-        print(f"🔑 Loaded {len(self.api_keys)} YouTube API keys")
+        logger.info("🔑 Loaded %s YouTube API keys", len(self.api_keys))
         
-        # Initialize API rotation
+        # Initialize API rotation; each request takes the least-used available key
         self.current_api_index = 0
         self.api_usage_count = {}  # Track usage per API
-        self.rate_limited_apis = set()  # Track rate-limited APIs
+        self._cooldown_until = [0.0] * len(self.api_keys)  # Monotonic time each key may be used again
+        self._api_lock = threading.Lock()
         
         # Initialize each API
         for i, key in enumerate(self.api_keys):
             self.api_usage_count[i] = 0
         
-        # Create initial YouTube client
-        self.youtube = self._build_youtube_client()
+        # Min-heap of (usage count, API index); ties go to the lower index
+        self._key_heap = [(0, i) for i in range(len(self.api_keys))]
+        
+        # Per-thread HTTP connections, kept alive across requests
+        self._thread_local = threading.local()
+        
+        # Caps in-flight API requests across all threads, scaled by key count
+        self._request_slots = threading.BoundedSemaphore(len(self.api_keys) * self.CONCURRENT_REQUESTS_PER_KEY)
+        
+        # Slow-changing responses (search, video details, trending) served from
+        # memory, backed by an on-disk tier that survives restarts
+        self._cache = TTLCache(maxsize=self.config.YOUTUBE_CACHE_SIZE)
+        self._disk_cache = self._open_disk_cache()
+        
+        # In-flight comment fetches by (video ID, limit), shared by concurrent callers
+        self._inflight_comments = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Long-lived pool for per-video comment fetches, shared by concurrent queries
+        self._video_pool = ThreadPoolExecutor(
+            max_workers=self.config.IO_POOL_WORKERS,
+            thread_name_prefix="yt-video"
+        )
+        
+        # Prefetches of the next comment page; separate from the video pool so
+        # video workers waiting on a page never starve the pool it loads on
+        self._page_pool = ThreadPoolExecutor(
+            max_workers=len(self.api_keys) * self.CONCURRENT_REQUESTS_PER_KEY,
+            thread_name_prefix="yt-pages"
+        )
+        
+        # Separate pool for full reply lists, so video workers waiting on their
+        # replies never starve the pool those replies run on
+        self._reply_pool = None
+        if self.config.YOUTUBE_FETCH_ALL_REPLIES:
+            self._reply_pool = ThreadPoolExecutor(
+                max_workers=len(self.api_keys) * self.CONCURRENT_REQUESTS_PER_KEY,
+                thread_name_prefix="yt-replies"
+            )
+        
+        # One client per API key, built up front and reused for every request
+        self._clients = [self._build_youtube_client(i) for i in range(len(self.api_keys))]
+        self.youtube = self._clients[0]
     
-    def _build_youtube_client(self):
-        """Build YouTube API client with current API key"""
-        current_key = self.api_keys[self.current_api_index]
-        return build('youtube', 'v3', developerKey=current_key)
+    def _get_http(self):
+        """Get this thread's persistent HTTP connection
+
+        httplib2 connections are not thread-safe, so each worker thread keeps
+        its own and reuses it for every request instead of reconnecting.
+        """
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = build_http()
+            self._thread_local.http = http
+        return http
     
-    def _get_next_available_api(self):
-        """Get next available API key that's not rate limited"""
-        start_index = self.current_api_index
-        attempts = 0
-        
-        while attempts < len(self.api_keys):
-            # Try next API key
-            self.current_api_index = (self.current_api_index + 1) % len(self.api_keys)
-            
-            # Check if this API is not rate limited
-            if self.current_api_index not in self.rate_limited_apis:
-                print(f"🔄 Switched to API key #{self.current_api_index + 1}")
-                self.youtube = self._build_youtube_client()
-                return True
+    def _build_youtube_client(self, api_index):
+        """Build YouTube API client for the given API key
+
+        Uses the discovery document bundled with googleapiclient, so building
+        never fetches it over the network or touches the discovery file cache.
+        """
+        return build(
+            'youtube', 'v3',
+            developerKey=self.api_keys[api_index],
+            static_discovery=True,
+            cache_discovery=False,
+            model=OrjsonModel(data_wrapper=False)
+        )
+    
+    def _get_client(self, api_index):
+        """Get the prebuilt client for an API key"""
+        return self._clients[api_index]
+    
+    def _next_api_index(self):
+        """Take the least-used API key that's not cooling down after a rate limit
+
+        When every key is cooling down, waits for the first one to be usable
+        again if that's only a few seconds off; otherwise fails right away
+        rather than holding the calling worker for the rest of the cooldown.
+        """
+        while True:
+            with self._api_lock:
+                now = time.monotonic()
+                skipped = []
+                try:
+                    while self._key_heap:
+                        usage, api_index = heapq.heappop(self._key_heap)
+                        if self._cooldown_until[api_index] > now:
+                            skipped.append((usage, api_index))
+                            continue
+                        heapq.heappush(self._key_heap, (usage + 1, api_index))
+                        self.current_api_index = api_index
+                        self.api_usage_count[api_index] += 1
+                        return api_index
+                finally:
+                    # Cooling keys go back in place for when they recover
+                    for entry in skipped:
+                        heapq.heappush(self._key_heap, entry)
+                
+                wait_time = min(self._cooldown_until) - now
             
-            attempts += 1
-        
-        # All APIs are rate limited - reset rate limits after cooldown
-        print("⚠️ All APIs are rate limited. Resetting and waiting...")
-        self.rate_limited_apis.clear()
-        time.sleep(60)  # Wait 1 minute before retrying
-        return True
+            if wait_time > self.MAX_COOLDOWN_WAIT_SECONDS:
+                raise RateLimitError("All YouTube API keys are rate limited")
+            logger.warning("⚠️ All APIs are rate limited. Next key frees up in %.0fs, waiting...", wait_time)
+            time.sleep(wait_time)
+    
+    def _cooldown_seconds(self, error):
+        """How long a rate-limited key should rest, from Retry-After if the API sent one"""
+        try:
+            retry_after = error.resp.get('retry-after')
+            if retry_after:
+                return float(retry_after)
+        except (AttributeError, TypeError, ValueError):
+            pass
+        return self.config.YOUTUBE_KEY_COOLDOWN_SECONDS
     
     def _handle_api_request(self, request_func, *args, **kwargs):
-        """Handle API request with automatic rotation on rate limits"""
+        """Handle API request with automatic rotation on rate limits
+
+        ``request_func`` is called with the client for the API key chosen for
+        this attempt, followed by ``args`` and ``kwargs``.
+        """
         max_retries = len(self.api_keys) + 1
         retry_count = 0
         
         while retry_count < max_retries:
+            api_index = self._next_api_index()
             try:
-                # Track usage
-                self.api_usage_count[self.current_api_index] += 1
-                
-                # Execute the request
-                result = request_func(*args, **kwargs)
+                # Execute the request once an in-flight slot is free
+                with self._request_slots:
+                    result = request_func(self._get_client(api_index), *args, **kwargs)
                 return result
                 
             except HttpError as e:
@@ -88,17 +239,14 @@ class YouTubeService:
                     # Check if it's a quota exceeded error
                     error_details = str(e)
                     if 'quotaExceeded' in error_details or 'dailyLimitExceeded' in error_details:
-                        print(f"⚠️ API key #{self.current_api_index + 1} hit rate limit. Switching to next API...")
-                        
-                        # Mark current API as rate limited
-                        self.rate_limited_apis.add(self.current_api_index)
+                        logger.warning("⚠️ API key #%s hit rate limit. Switching to next API...", api_index + 1)
                         
-                        # Try next API
-                        if self._get_next_available_api():
-                            retry_count += 1
-                            continue
-                        else:
-                            raise Exception("All YouTube API keys are rate limited")
+                        # Rest this API; attempts skip it until its cooldown ends
+                        cooldown_until = time.monotonic() + self._cooldown_seconds(e)
+                        with self._api_lock:
+                            self._cooldown_until[api_index] = cooldown_until
+                        retry_count += 1
+                        continue
                     else:
                         # Other 403 error, don't retry
                         raise e
@@ -109,8 +257,12 @@ class YouTubeService:
             except Exception as e:
                 # Network or other error, retry with same API
                 if retry_count < 2:
-                    print(f"⚠️ Request failed, retrying... ({str(e)})")
-                    time.sleep(random.uniform(1, 3))
+                    # Exponential backoff with full jitter, so parallel workers
+                    # that failed together don't all retry together
+                    backoff_cap = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** retry_count)
+                    delay = random.uniform(0, backoff_cap)
+                    logger.warning("⚠️ Request failed, retrying in %.1fs... (%s)", delay, e)
+                    time.sleep(delay)
                     retry_count += 1
                     continue
                 else:
@@ -120,182 +272,389 @@ class YouTubeService:
     
     def sanitize_query_for_filename(self, query):
         """Sanitize query string to be safe for filenames"""
-        # Replace spaces with underscores
-        sanitized = query.replace(' ', '_')
-        # Remove or replace special characters that are problematic in filenames
-        sanitized = ''.join(c for c in sanitized if c.isalnum() or c in '_-')
-        # Limit length to avoid overly long filenames
-        if len(sanitized) > self.config.MAX_FILENAME_LENGTH:
-            sanitized = sanitized[:self.config.MAX_FILENAME_LENGTH]
-        # Remove trailing underscores
-        sanitized = sanitized.rstrip('_')
-        return sanitized.lower()
+        return _sanitize_query_for_filename(query, self.config.MAX_FILENAME_LENGTH)
+    
+    def _open_disk_cache(self):
+        """Open the persistent response cache, or None if disabled or unavailable"""
+        if not self.config.YOUTUBE_DISK_CACHE:
+            return None
+        try:
+            return DiskCache(os.path.join(self.config.CACHE_DIRECTORY, 'youtube_cache.sqlite3'))
+        except Exception as e:
+            logger.warning("⚠️ YouTube disk cache unavailable, caching in memory only: %s", e)
+            return None
+    
+    def _cache_get(self, key):
+        """Look up a cached response in memory, then on disk"""
+        value = self._cache.get(key)
+        if value is None and self._disk_cache is not None:
+            entry = self._disk_cache.get_entry(key)
+            if entry is not None:
+                expires_at, value = entry
+                # Keep the disk entry's expiry when promoting it to memory
+                self._cache.set(key, value, ttl=expires_at - time.time())
+        return value
+    
+    def _cache_set(self, key, value, ttl):
+        """Cache a response in memory and on disk"""
+        self._cache.set(key, value, ttl=ttl)
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, value, ttl=ttl)
+    
+    def clear_cache(self):
+        """Drop every cached search, video details and trending response"""
+        self._cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
     
     def search_videos(self, query, max_results=None):
         """Search for multiple videos based on query"""
         if max_results is None:
             max_results = self.config.MAX_VIDEOS_PER_QUERY
         
+        query_digest = hashlib.sha1(query.encode('utf-8')).hexdigest()
+        cache_key = f"yt:search:{query_digest}:{max_results}"
+        cached_videos = self._cache_get(cache_key)
+        if cached_videos is not None:
+            logger.info("⚡ Using %s cached YouTube search results for: '%s'", len(cached_videos), query)
+            return [dict(video) for video in cached_videos]
+        
         try:
-            print(f"🔍 Searching YouTube for: '{query}' (max results: {max_results}) [API #{self.current_api_index + 1}]")
+            logger.info("🔍 Searching YouTube for: '%s' (max results: %s) [API #%s]", query, max_results, self.current_api_index + 1)
             
             # Define the request function
-            def make_request():
-                return self.youtube.search().list(
+            def make_request(youtube):
+                return youtube.search().list(
                     q=query,
                     part='id,snippet',
                     maxResults=max_results,
                     type='video',
                     order='relevance'
-                ).execute()
+                ).execute(http=self._get_http())
             
             # Execute request with API rotation
             search_response = self._handle_api_request(make_request)
 
             videos = []
             for item in search_response['items']:
+                snippet = item['snippet']
+                thumbnails = snippet['thumbnails']
                 video_data = {
                     'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'channel': item['snippet']['channelTitle'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail': item['snippet']['thumbnails']['high']['url'] if 'high' in item['snippet']['thumbnails'] else item['snippet']['thumbnails']['default']['url']
+                    'title': snippet['title'],
+                    'channel': snippet['channelTitle'],
+                    'description': snippet['description'],
+                    'published_at': snippet['publishedAt'],
+                    'thumbnail': (thumbnails.get('high') or thumbnails['default'])['url']
                 }
                 videos.append(video_data)
 
-            print(f"✅ Found {len(videos)} YouTube videos [API #{self.current_api_index + 1}]")
-            return videos
+            logger.info("✅ Found %s YouTube videos [API #%s]", len(videos), self.current_api_index + 1)
+            self._cache_set(cache_key, tuple(videos), self.config.YOUTUBE_SEARCH_CACHE_TTL)
+            return [dict(video) for video in videos]
 
+        except RateLimitError:
+            # Let the caller back off instead of reading this as "no videos"
+            raise
         except Exception as e:
-            print(f"❌ Error searching YouTube videos: {e}")
+            logger.error("❌ Error searching YouTube videos: %s", e)
             return []
     
-    def get_comments(self, video_id, max_comments=None):
-        """Fetch comments and replies from a video"""
+    def get_comments(self, video_id, max_comments=None, stop_event=None):
+        """Fetch comments and replies from a video
+
+        If ``stop_event`` is set, no further comment pages are requested.
+        Concurrent calls for the same video and limit share one fetch: the
+        first caller runs it and the others wait for its result. If that
+        fetch was cut short by its caller's ``stop_event``, the others fetch
+        again rather than take the truncated list.
+        """
         if max_comments is None:
             max_comments = self.config.MAX_COMMENTS_PER_VIDEO
         
+        key = (video_id, max_comments)
+        with self._inflight_lock:
+            future = self._inflight_comments.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight_comments[key] = future
+        
+        if not is_owner:
+            logger.debug("🔗 Joining in-flight comment fetch for video: %s", video_id)
+            comments, stopped = future.result()
+            if stopped:
+                return self.get_comments(video_id, max_comments, stop_event)
+            return list(comments)
+        
+        comments = []
+        try:
+            comments = self._fetch_comments(video_id, max_comments, stop_event)
+            return comments
+        finally:
+            with self._inflight_lock:
+                del self._inflight_comments[key]
+            future.set_result((comments, stop_event is not None and stop_event.is_set()))
+    
+    def _fetch_comments(self, video_id, max_comments, stop_event=None):
+        """Fetch up to ``max_comments`` comments and replies from a video"""
         try:
-            print(f"💬 Fetching comments for video: {video_id} (max: {max_comments}) [API #{self.current_api_index + 1}]")
+            logger.debug("💬 Fetching comments for video: %s (max: %s) [API #%s]", video_id, max_comments, self.current_api_index + 1)
+            
+            def fetch_page(page_token, page_size):
+                # Define the request function
+                def make_request(youtube):
+                    return youtube.commentThreads().list(
+                        part='snippet,replies',
+                        videoId=video_id,
+                        maxResults=page_size,
+                        order='relevance',
+                        pageToken=page_token
+                    ).execute(http=self._get_http())
+                
+                # Execute request with API rotation
+                return self._handle_api_request(make_request)
             
             comments = []
             next_page_token = None
+            page_future = None  # Prefetch of the next page, started before parsing the current one
+            reply_pool = self._reply_pool
+            max_replies = self.config.MAX_REPLIES_PER_COMMENT
+            pending_replies = []  # (reply list to fill, future with the full list)
 
             while len(comments) < max_comments:
+                if stop_event is not None and stop_event.is_set():
+                    break
                 try:
-                    # Define the request function
-                    def make_request():
-                        return self.youtube.commentThreads().list(
-                            part='snippet,replies',
-                            videoId=video_id,
-                            maxResults=min(100, max_comments - len(comments)),
-                            order='relevance',
-                            pageToken=next_page_token
-                        ).execute()
+                    if page_future is None:
+                        response = fetch_page(next_page_token, min(100, max_comments - len(comments)))
+                    else:
+                        response = page_future.result()
+                        page_future = None
                     
-                    # Execute request with API rotation
-                    response = self._handle_api_request(make_request)
+                    # Start loading the next page so it arrives while this one is parsed
+                    next_page_token = response.get('nextPageToken')
+                    remaining = max_comments - len(comments) - len(response['items'])
+                    if next_page_token and remaining > 0 and not (stop_event is not None and stop_event.is_set()):
+                        page_future = self._page_pool.submit(fetch_page, next_page_token, min(100, remaining))
                     
+                    append_comment = comments.append
                     for item in response['items']:
-                        comment = item['snippet']['topLevelComment']['snippet']
-                        comment_data = {
+                        thread = item['snippet']
+                        comment = thread['topLevelComment']['snippet']
+
+                        # Fetch replies if any
+                        reply_items = item['replies']['comments'] if thread['totalReplyCount'] > 0 and 'replies' in item else ()
+                        replies = [_parse_reply(reply_item['snippet']) for reply_item in reply_items]
+
+                        # The thread only embeds a few replies; fetch the rest in the
+                        # background while the next page loads
+                        if reply_pool is not None and thread['totalReplyCount'] > len(replies):
+                            pending_replies.append((replies, reply_pool.submit(
+                                self._fetch_all_replies, thread['topLevelComment']['id'], max_replies
+                            )))
+
+                        append_comment({
                             'author': comment['authorDisplayName'],
                             'text': comment['textDisplay'],
                             'likes': comment['likeCount'],
                             'published_at': comment['publishedAt'],
                             'author_profile': comment.get('authorProfileImageUrl', ''),
-                            'replies': []
-                        }
+                            'replies': replies
+                        })
 
-                        # Fetch replies if any
-                        if item['snippet']['totalReplyCount'] > 0 and 'replies' in item:
-                            for reply_item in item['replies']['comments']:
-                                reply = reply_item['snippet']
-                                reply_data = {
-                                    'author': reply['authorDisplayName'],
-                                    'text': reply['textDisplay'],
-                                    'likes': reply['likeCount'],
-                                    'published_at': reply['publishedAt'],
-                                    'author_profile': reply.get('authorProfileImageUrl', '')
-                                }
-                                comment_data['replies'].append(reply_data)
-
-                        comments.append(comment_data)
-
-                    next_page_token = response.get('nextPageToken')
                     if not next_page_token:
                         break
                         
                 except Exception as e:
-                    print(f"⚠️  Error fetching comments page: {e}")
+                    logger.warning("⚠️  Error fetching comments page: %s", e)
                     break
 
-            print(f"✅ Fetched {len(comments)} comments from video {video_id}")
+            # A prefetch left over after a stop or error is no longer needed
+            if page_future is not None:
+                page_future.cancel()
+
+            # Swap in the full reply lists; a failed fetch keeps the embedded replies
+            for replies, future in pending_replies:
+                all_replies = future.result()
+                if all_replies:
+                    replies[:] = all_replies
+
+            logger.debug("✅ Fetched %s comments from video %s", len(comments), video_id)
             return comments
 
         except Exception as e:
-            print(f"❌ Error fetching comments from video {video_id}: {e}")
+            logger.error("❌ Error fetching comments from video %s: %s", video_id, e)
             return []
     
+    def _fetch_all_replies(self, parent_id, max_replies):
+        """Fetch up to ``max_replies`` replies to a top-level comment"""
+        replies = []
+        next_page_token = None
+        
+        try:
+            while len(replies) < max_replies:
+                # Define the request function
+                def make_request(youtube):
+                    return youtube.comments().list(
+                        part='snippet',
+                        parentId=parent_id,
+                        maxResults=min(100, max_replies - len(replies)),
+                        pageToken=next_page_token
+                    ).execute(http=self._get_http())
+                
+                # Execute request with API rotation
+                response = self._handle_api_request(make_request)
+                replies.extend(_parse_reply(item['snippet']) for item in response['items'])
+                
+                next_page_token = response.get('nextPageToken')
+                if not next_page_token:
+                    break
+            
+            return replies
+            
+        except Exception as e:
+            logger.warning("⚠️  Error fetching replies for comment %s: %s", parent_id, e)
+            return replies
+    
+    def _parse_video_details(self, video):
+        """Convert a videos().list item into our video details format"""
+        snippet = video['snippet']
+        statistics = video['statistics']
+        return {
+            'video_id': video['id'],
+            'title': snippet['title'],
+            'description': snippet['description'],
+            'channel_title': snippet['channelTitle'],
+            'published_at': snippet['publishedAt'],
+            'view_count': int(statistics.get('viewCount', 0)),
+            'like_count': int(statistics.get('likeCount', 0)),
+            'comment_count': int(statistics.get('commentCount', 0)),
+            'duration': video['contentDetails']['duration'],
+            'thumbnails': snippet['thumbnails']
+        }
+    
     def get_video_details(self, video_id):
         """Get detailed information about a video"""
+        cached_details = self._cache_get(f"yt:videos:{video_id}")
+        if cached_details is not None:
+            return dict(cached_details)
+        
         try:
             # Define the request function
-            def make_request():
-                return self.youtube.videos().list(
+            def make_request(youtube):
+                return youtube.videos().list(
                     part='snippet,statistics,contentDetails',
                     id=video_id
-                ).execute()
+                ).execute(http=self._get_http())
             
             # Execute request with API rotation
             response = self._handle_api_request(make_request)
             
             if response['items']:
-                video = response['items'][0]
-                return {
-                    'video_id': video_id,
-                    'title': video['snippet']['title'],
-                    'description': video['snippet']['description'],
-                    'channel_title': video['snippet']['channelTitle'],
-                    'published_at': video['snippet']['publishedAt'],
-                    'view_count': int(video['statistics'].get('viewCount', 0)),
-                    'like_count': int(video['statistics'].get('likeCount', 0)),
-                    'comment_count': int(video['statistics'].get('commentCount', 0)),
-                    'duration': video['contentDetails']['duration'],
-                    'thumbnails': video['snippet']['thumbnails']
-                }
+                details = self._parse_video_details(response['items'][0])
+                self._cache_set(f"yt:videos:{video_id}", details, self.config.YOUTUBE_DETAILS_CACHE_TTL)
+                return dict(details)
             
             return None
             
         except Exception as e:
-            print(f"❌ Error getting video details for {video_id}: {e}")
+            logger.error("❌ Error getting video details for %s: %s", video_id, e)
             return None
     
-    def search_and_get_comments(self, query, max_videos=None, max_comments_per_video=None):
-        """Search for videos and get their comments in one operation"""
+    def get_video_details_batch(self, video_ids):
+        """Get detailed information about many videos, keyed by video ID
+
+        IDs are looked up 50 per request instead of one request per video,
+        and cached details are reused without a request. Videos the API
+        doesn't return are missing from the result.
+        """
+        details = {}
+        missing_ids = []
+        for video_id in video_ids:
+            cached_details = self._cache_get(f"yt:videos:{video_id}")
+            if cached_details is not None:
+                details[video_id] = dict(cached_details)
+            else:
+                missing_ids.append(video_id)
+        
+        details_ttl = self.config.YOUTUBE_DETAILS_CACHE_TTL
+        chunk_size = self.VIDEO_IDS_PER_REQUEST
+        
+        for start in range(0, len(missing_ids), chunk_size):
+            chunk = missing_ids[start:start + chunk_size]
+            try:
+                # Define the request function
+                def make_request(youtube):
+                    return youtube.videos().list(
+                        part='snippet,statistics,contentDetails',
+                        id=','.join(chunk)
+                    ).execute(http=self._get_http())
+                
+                # Execute request with API rotation
+                response = self._handle_api_request(make_request)
+                
+                for video in response['items']:
+                    video_details = self._parse_video_details(video)
+                    self._cache_set(f"yt:videos:{video['id']}", video_details, details_ttl)
+                    details[video['id']] = dict(video_details)
+                    
+            except Exception as e:
+                logger.error("❌ Error getting video details for %s videos: %s", len(chunk), e)
+        
+        return details
+    
+    def search_and_get_comments(self, query, max_videos=None, max_comments_per_video=None, stop_event=None):
+        """Search for videos and get their comments in one operation
+
+        If ``stop_event`` is set while running, remaining videos are skipped
+        and the comments collected so far are returned.
+        """
         if max_videos is None:
             max_videos = self.config.MAX_VIDEOS_PER_QUERY
         if max_comments_per_video is None:
             max_comments_per_video = self.config.MAX_COMMENTS_PER_VIDEO
         
-        print(f"🚀 Starting YouTube search and comment fetch for: '{query}'")
+        logger.info("🚀 Starting YouTube search and comment fetch for: '%s'", query)
         
         # Search for videos
         videos = self.search_videos(query, max_videos)
         
         if not videos:
-            print("❌ No videos found")
+            logger.warning("❌ No videos found")
             return []
         
-        # Get comments for each video
+        # One batched details lookup tells us which videos have no comments,
+        # saving a commentThreads request for each of them
+        details = self.get_video_details_batch([video['video_id'] for video in videos])
+        if details:
+            commented_videos = [
+                video for video in videos
+                if video['video_id'] not in details or details[video['video_id']]['comment_count'] > 0
+            ]
+            if len(commented_videos) < len(videos):
+                logger.info("⏭️  Skipping %s videos without comments", len(videos) - len(commented_videos))
+            videos = commented_videos
+        
+        # Get comments for all videos concurrently; results keep search order
+        def fetch_video_comments(i, video):
+            if stop_event is not None and stop_event.is_set():
+                return None
+            logger.debug("📹 Processing video %s/%s: %.50s...", i + 1, len(videos), video['title'])
+            return self.get_comments(video['video_id'], max_comments_per_video, stop_event)
+        
+        futures = [self._video_pool.submit(fetch_video_comments, i, video) for i, video in enumerate(videos)]
+        
         videos_with_comments = []
         total_comments = 0
+        skipped_videos = 0
         
-        for i, video in enumerate(videos):
+        for i, (video, future) in enumerate(zip(videos, futures)):
             try:
-                print(f"📹 Processing video {i+1}/{len(videos)}: {video['title'][:50]}...")
-                comments = self.get_comments(video['video_id'], max_comments_per_video)
+                comments = future.result()
+                if comments is None:
+                    skipped_videos += 1
+                    continue
                 
                 video_data = {
                     'video_info': video,
@@ -307,49 +666,61 @@ class YouTubeService:
                 videos_with_comments.append(video_data)
                 total_comments += len(comments)
                 
-                print(f"  ✅ Got {len(comments)} comments")
+                logger.debug("  ✅ Got %s comments", len(comments))
                 
             except Exception as e:
-                print(f"  ❌ Error processing video {i+1}: {e}")
+                logger.error("  ❌ Error processing video %s: %s", i + 1, e)
                 continue
         
-        print(f"🎯 YouTube fetch complete: {len(videos_with_comments)} videos, {total_comments} total comments")
+        if skipped_videos:
+            logger.info("🛑 Stop requested - skipped %s videos", skipped_videos)
+        
+        logger.info("🎯 YouTube fetch complete: %s videos, %s total comments", len(videos_with_comments), total_comments)
         return videos_with_comments
     
     def get_trending_videos(self, max_results=10, region_code='US'):
         """Get trending videos for a region"""
+        cache_key = f"yt:trending:{region_code}:{max_results}"
+        cached_videos = self._cache_get(cache_key)
+        if cached_videos is not None:
+            return [dict(video) for video in cached_videos]
+        
         try:
             # Define the request function
-            def make_request():
-                return self.youtube.videos().list(
+            def make_request(youtube):
+                return youtube.videos().list(
                     part='snippet,statistics',
                     chart='mostPopular',
                     regionCode=region_code,
                     maxResults=max_results
-                ).execute()
+                ).execute(http=self._get_http())
             
             # Execute request with API rotation
             response = self._handle_api_request(make_request)
             
             trending_videos = []
             for item in response['items']:
+                snippet = item['snippet']
+                statistics = item['statistics']
+                thumbnails = snippet['thumbnails']
                 video_data = {
                     'video_id': item['id'],
-                    'title': item['snippet']['title'],
-                    'channel': item['snippet']['channelTitle'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'view_count': int(item['statistics'].get('viewCount', 0)),
-                    'like_count': int(item['statistics'].get('likeCount', 0)),
-                    'comment_count': int(item['statistics'].get('commentCount', 0)),
-                    'thumbnail': item['snippet']['thumbnails']['high']['url'] if 'high' in item['snippet']['thumbnails'] else item['snippet']['thumbnails']['default']['url']
+                    'title': snippet['title'],
+                    'channel': snippet['channelTitle'],
+                    'description': snippet['description'],
+                    'published_at': snippet['publishedAt'],
+                    'view_count': int(statistics.get('viewCount', 0)),
+                    'like_count': int(statistics.get('likeCount', 0)),
+                    'comment_count': int(statistics.get('commentCount', 0)),
+                    'thumbnail': (thumbnails.get('high') or thumbnails['default'])['url']
                 }
                 trending_videos.append(video_data)
             
-            return trending_videos
+            self._cache_set(cache_key, tuple(trending_videos), self.config.YOUTUBE_TRENDING_CACHE_TTL)
+            return [dict(video) for video in trending_videos]
             
         except Exception as e:
-            print(f"❌ Error getting trending videos: {e}")
+            logger.error("❌ Error getting trending videos: %s", e)
             return []
     
     def get_api_usage_stats(self):
@@ -357,10 +728,26 @@ class YouTubeService:
         return {
             'total_apis': len(self.api_keys),
             'current_api': self.current_api_index + 1,
-            'rate_limited_apis': len(self.rate_limited_apis),
+            'rate_limited_apis': sum(1 for until in self._cooldown_until if until > time.monotonic()),
             'usage_per_api': self.api_usage_count
         }
 
 
-# Global YouTube service instance
-youtube_service = YouTubeService()
\ No newline at end of file
+# Shared YouTube service instance, created on first use
+_youtube_service = None
+_youtube_service_lock = threading.Lock()
+
+
+def get_youtube_service():
+    """Get the shared YouTube service, creating it on first use
+
+    Building the service parses the API keys and builds a client per key,
+    so importers that never touch YouTube don't pay for it, and a missing
+    key surfaces as an error at the call site instead of at import time.
+    """
+    global _youtube_service
+    if _youtube_service is None:
+        with _youtube_service_lock:
+            if _youtube_service is None:
+                _youtube_service = YouTubeService()
+    return _youtube_service
\ No newline at end of file
@@ -9,7 +9,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.youtube_service import youtube_service
+from services.youtube_service import get_youtube_service
 from services.ai_service import ai_service
 from services.comment_fetcher import comment_fetcher
 
@@ -19,6 +19,8 @@ def test_api_rotation():
     print("🔑 Testing YouTube API rotation system...")
     
     try:
+        youtube_service = get_youtube_service()
+        
         # Test API usage stats
         stats = youtube_service.get_api_usage_stats()
         print(f"✅ API Stats: {stats}")
@@ -0,0 +1,138 @@
+"""
+Caching utilities for expensive API and AI calls
+Provides a thread-safe in-process LRU cache with per-entry expiry, and a
+SQLite-backed cache that persists entries across restarts and processes
+"""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+import orjson
+from utils.log_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache holding at most ``maxsize`` entries, each for ``ttl`` seconds"""
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value), least recent first
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get a cached value, or ``default`` if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Cache a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """Persistent cache of JSON-serializable values with per-entry expiry
+
+    Entries live in a SQLite file, so they survive restarts and are shared
+    by every worker process pointed at the same file. Expiry uses wall-clock
+    time since entries outlive the process. Storage errors are reported and
+    treated as cache misses, so a broken cache never fails the caller.
+
+    Values are zlib-compressed (JSON API responses shrink several times over)
+    at ``compress_level``, trading a little CPU for far less disk I/O.
+    """
+
+    def __init__(self, path, ttl=3600, compress_level=3):
+        self.path = path
+        self.ttl = ttl
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)'
+        )
+        self.expire()
+
+    def get_entry(self, key):
+        """Get ``(expires_at, value)`` for a live entry, or None if missing, expired or unreadable"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT expires_at, value FROM cache WHERE key = ? AND expires_at > ?', (key, time.time())
+                ).fetchone()
+            return None if row is None else (row[0], orjson.loads(zlib.decompress(row[1])))
+        except Exception as e:
+            logger.warning("⚠️ Disk cache read failed for %s: %s", key, e)
+            return None
+
+    def get(self, key, default=None):
+        """Get a cached value, or ``default`` if missing, expired or unreadable"""
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Cache a value, replacing any existing entry for the key"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            payload = zlib.compress(orjson.dumps(value), self.compress_level)
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)',
+                    (key, expires_at, payload)
+                )
+        except Exception as e:
+            logger.warning("⚠️ Disk cache write failed for %s: %s", key, e)
+
+    def expire(self):
+        """Delete every expired entry; returns how many were removed"""
+        try:
+            with self._lock:
+                return self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),)).rowcount
+        except Exception as e:
+            logger.warning("⚠️ Disk cache purge failed: %s", e)
+            return 0
+
+    def clear(self):
+        """Drop every cached entry"""
+        try:
+            with self._lock:
+                self._conn.execute('DELETE FROM cache')
+        except Exception as e:
+            logger.warning("⚠️ Disk cache clear failed: %s", e)
@@ -3,13 +3,25 @@ File utilities for saving and loading JSON data
 Handles file operations, directory creation, and filename sanitization
 """
 import os
+import re
 import json
 from datetime import datetime
+from functools import lru_cache
+import orjson
 from config import Config
 
 
+# Anything other than letters, digits, underscores and hyphens
+INVALID_FILENAME_CHARS = re.compile(r'[^\w-]')
+_UNDERSCORE_RUNS = re.compile(r'__+')
+
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(filename):
-    """Sanitize a string to be safe for use as a filename"""
+    """Sanitize a string to be safe for use as a filename
+
+    Results are cached, since the same queries are sanitized again and again.
+    """
     if not filename or not filename.strip():
         return "unknown_file"
     
@@ -17,11 +29,10 @@ def sanitize_filename(filename):
     sanitized = filename.strip().replace(' ', '_')
     
     # Remove or replace special characters that are problematic in filenames
-    sanitized = ''.join(c for c in sanitized if c.isalnum() or c in '_-')
+    sanitized = INVALID_FILENAME_CHARS.sub('', sanitized)
     
     # Remove multiple consecutive underscores
-    while '__' in sanitized:
-        sanitized = sanitized.replace('__', '_')
+    sanitized = _UNDERSCORE_RUNS.sub('_', sanitized)
     
     # Limit length to avoid overly long filenames
     max_length = Config.MAX_FILENAME_LENGTH
@@ -49,7 +60,11 @@ def ensure_directory_exists(directory_path):
 
 
 def save_to_json_file(data, directory, filename_prefix, encoding='utf-8'):
-    """Save data to a JSON file with proper error handling"""
+    """Save data to a JSON file with proper error handling
+
+    Serialized with orjson, which always writes UTF-8; ``encoding`` is kept
+    for backwards compatibility.
+    """
     try:
         # Ensure directory exists
         if not ensure_directory_exists(directory):
@@ -60,8 +75,8 @@ def save_to_json_file(data, directory, filename_prefix, encoding='utf-8'):
         filepath = os.path.join(directory, filename)
         
         # Save data to file
-        with open(filepath, 'w', encoding=encoding) as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"✅ Data saved to: {filepath}")
         return filepath
@@ -71,6 +86,32 @@ def save_to_json_file(data, directory, filename_prefix, encoding='utf-8'):
         return None
 
 
+def save_to_jsonl_file(records, directory, filename_prefix):
+    """Stream records to a JSON Lines file, one record per line
+
+    Only a single record is ever serialized in memory, so large result sets
+    are written without building the whole document first.
+    """
+    try:
+        if not ensure_directory_exists(directory):
+            return None
+
+        filename = f"{filename_prefix}.jsonl"
+        filepath = os.path.join(directory, filename)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        with open(filepath, 'wb') as f:
+            for record in records:
+                f.write(orjson.dumps(record, option=option))
+
+        print(f"✅ Data saved to: {filepath}")
+        return filepath
+
+    except Exception as e:
+        print(f"❌ Error saving data to {directory}/{filename_prefix}.jsonl: {e}")
+        return None
+
+
 def load_from_json_file(filepath, encoding='utf-8'):
     """Load data from a JSON file with proper error handling"""
     try:
@@ -2,16 +2,44 @@
 Helper utilities and common functions
 Contains various utility functions used across the application
 """
+import os
 import re
 import time
-import uuid
+import hashlib
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 
 def generate_batch_id(length: int = 8) -> str:
     """Generate a unique batch ID"""
-    return str(uuid.uuid4())[:length]
+    return os.urandom((length + 1) // 2).hex()[:length]
+
+
+def text_digest(text: str, digest_size: int = 16) -> bytes:
+    """Get a compact fixed-size digest of text for use as a dedup key"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=digest_size).digest()
+
+
+def text_hash64(text: str) -> int:
+    """Get a 64-bit integer hash of text for compact set-based dedup"""
+    return int.from_bytes(text_digest(text, digest_size=8), 'little')
+
+
+# Runs of punctuation, symbols (incl. emoji) and whitespace collapse to one space
+_NON_WORD_RUN = re.compile(r'[\W_]+')
+
+
+def normalize_comment_text(text: str) -> str:
+    """Normalize comment text into a dedup key that ignores case, punctuation and spacing
+
+    "Great video!" and "great   video 🙂" map to the same key. Text made up
+    only of symbols keeps its case-folded form so it still gets a key. The
+    full text is kept, so long comments sharing an opening (e.g. replies
+    quoting their parent) stay distinct.
+    """
+    folded = text.casefold()
+    normalized = _NON_WORD_RUN.sub(' ', folded).strip()
+    return normalized or folded
 
 
 def get_current_timestamp() -> str:
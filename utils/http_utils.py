@@ -0,0 +1,68 @@
+"""
+HTTP utilities for outbound API traffic
+Provides a shared keep-alive connection pool for the API clients
+"""
+import socket
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from config import Config
+
+
+_session = None
+_session_lock = threading.Lock()
+
+# urllib3 defaults (TCP_NODELAY) plus TCP keepalive so idle pooled
+# sockets are not silently dropped by NAT/proxies between requests
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use SOCKET_OPTIONS"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_pooled_session(pool_connections=None, pool_maxsize=None):
+    """Create a requests session backed by a keep-alive connection pool"""
+    if pool_connections is None:
+        pool_connections = Config.HTTP_POOL_CONNECTIONS
+    if pool_maxsize is None:
+        pool_maxsize = Config.HTTP_POOL_MAXSIZE
+
+    adapter = KeepAliveAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        # Retry dropped connections and read timeouts only; HTTP statuses
+        # (429, 5xx) go straight to the API client, which has its own retry
+        # and rate-limit handling
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=2,
+            status=0,
+            backoff_factor=0.3,
+            status_forcelist=(),
+            respect_retry_after_header=False
+        )
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session():
+    """Get the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_pooled_session()
+    return _session
@@ -0,0 +1,49 @@
+"""
+Logging utilities for the application services
+Routes log records through a queue so worker threads never block on console I/O
+"""
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from config import Config
+
+
+_log_queue = None
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def _get_log_queue():
+    """Get the shared log queue, starting the background listener on first use"""
+    global _log_queue, _listener
+    if _log_queue is None:
+        with _setup_lock:
+            if _log_queue is None:
+                log_queue = queue.SimpleQueue()
+
+                console_handler = logging.StreamHandler(sys.stdout)
+                console_handler.setFormatter(logging.Formatter('%(message)s'))
+
+                _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+                _listener.start()
+                atexit.register(_listener.stop)
+
+                _log_queue = log_queue
+    return _log_queue
+
+
+def get_logger(name, level=None):
+    """Get a logger whose records are written by the background listener thread"""
+    if level is None:
+        level = Config.LOG_LEVEL
+    log_queue = _get_log_queue()
+    logger = logging.getLogger(name)
+    with _setup_lock:
+        if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+            logger.addHandler(QueueHandler(log_queue))
+            logger.setLevel(level)
+            logger.propagate = False
+    return logger
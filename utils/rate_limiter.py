@@ -0,0 +1,99 @@
+"""
+Rate limiting utilities for outbound API traffic
+Provides a thread-safe token bucket shared by every worker hitting one provider
+"""
+import json
+import threading
+import time
+
+
+# Google API error reasons that mean "slow down" on a 403
+RATE_LIMIT_REASONS = frozenset({'quotaExceeded', 'dailyLimitExceeded', 'rateLimitExceeded', 'userRateLimitExceeded'})
+
+
+class RateLimitError(Exception):
+    """Raised by a provider service when throttling leaves it with nothing to return"""
+
+
+def _google_error_reasons(error):
+    """Get the ``reason`` fields from a googleapiclient HttpError body"""
+    try:
+        body = json.loads(error.content)
+        return {detail.get('reason') for detail in body['error']['errors']}
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return set()
+
+
+def is_rate_limit_error(error):
+    """Check whether an exception is a provider throttling response
+
+    Matches RateLimitError, HTTP 429 responses (googleapiclient ``resp.status``,
+    or ``response.status_code`` as on prawcore's TooManyRequests) and Google
+    403s whose error reason is a quota or rate limit.
+    """
+    if isinstance(error, RateLimitError):
+        return True
+    
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    
+    if status == 429:
+        return True
+    if status == 403 and resp is not None:
+        return not RATE_LIMIT_REASONS.isdisjoint(_google_error_reasons(error))
+    return False
+
+
+class TokenBucket:
+    """Token bucket allowing ``capacity`` back-to-back acquires, refilled at ``rate`` per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens=1, timeout=None):
+        """Block until ``tokens`` are available; returns False if ``timeout`` expires first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return True
+                    wait_time = (tokens - self._tokens) / self.rate
+                else:
+                    wait_time = self._blocked_until - now
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait_time = min(wait_time, remaining)
+
+                self._condition.wait(wait_time)
+
+    def penalize(self, seconds):
+        """Drain the bucket and pause all acquires for ``seconds`` after a throttling response"""
+        with self._condition:
+            blocked_until = time.monotonic() + seconds
+            if blocked_until > self._blocked_until:
+                self._blocked_until = blocked_until
+                # Tokens start accruing again only once the pause is over
+                self._tokens = 0.0
+                self._updated = blocked_until